@@ -0,0 +1,26 @@
+"""
+Async versions of CategoryViewSet.list / retrieve for ASGI deployments
+(see core/async_views.py and config/urls_async.py).
+"""
+from core.async_views import (
+    DETAIL_ACTIONS, LIST_ACTIONS, acached_response, aget_object, alist, build_view, delegate, serve,
+)
+from .views import CategoryViewSet
+
+
+async def category_list(request):
+    view = build_view(CategoryViewSet, request, LIST_ACTIONS)
+    if view is None:
+        return await delegate(request)
+    return await serve(request, lambda: acached_response(view, lambda: alist(view)))
+
+
+async def category_detail(request, pk):
+    view = build_view(CategoryViewSet, request, DETAIL_ACTIONS, pk=pk)
+    if view is None:
+        return await delegate(request)
+
+    async def build():
+        return view.get_serializer(await aget_object(view, pk=pk)).data
+
+    return await serve(request, lambda: acached_response(view, build))
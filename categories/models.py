@@ -1,5 +1,7 @@
 from django.db import models
 from django.utils.text import slugify
+from core.cache import invalidate_catalog
+from core.slugs import save_with_unique_slug
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -8,9 +10,11 @@ class Category(models.Model):
     description = models.TextField(blank=True)
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_unique_slug(self, slugify(self.name), lambda: super(Category, self).save(*args, **kwargs))
+        invalidate_catalog()
 
     def __str__(self):
         return self.name
@@ -1,3 +1,19 @@
+from django.core.cache import cache
 from django.test import TestCase
+from .models import Category
 
-# Create your tests here.
+
+class CategoryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Category.objects.create(name='Trucks')
+
+    def test_list_cached_until_category_saved(self):
+        self.assertEqual(self.client.get('/api/categories/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/categories/')['X-Cache'], 'HIT')
+
+        Category.objects.create(name='Buses')
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
@@ -1,4 +1,5 @@
 from rest_framework import viewsets, serializers
+from core.cache import CachedListMixin, cached_response
 from .models import Category
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -6,6 +7,9 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = '__all__'
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(CachedListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all()
-    serializer_class = CategorySerializer
\ No newline at end of file
+    serializer_class = CategorySerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(request, lambda: self.get_serializer(self.get_object()).data)
\ No newline at end of file
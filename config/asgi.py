@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serving through it enables SERVE_ASYNC: the public read endpoints run as
+async views (see config/urls_async.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +14,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('SERVE_ASYNC', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# WhiteNoise only wraps WSGI; its WSGI app serves STATIC_ROOT here
+from core.static import StaticFilesApp  # noqa: E402
+
+application = StaticFilesApp(django_application)
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings, used by entrypoint.sh: gunicorn -c config/gunicorn.py <app>
+
+Workers default to 2 x CPUs + 1 (capped by GUNICORN_MAX_WORKERS), override
+with WEB_CONCURRENCY. SERVER_MODE=asgi runs uvicorn workers; otherwise
+threaded sync workers (gthread) serve GUNICORN_THREADS requests each.
+
+Every worker thread keeps its own database connection (DB_CONN_MAX_AGE), so
+the app holds up to workers x threads connections: keep that below the
+server's max_connections, or put PgBouncer in front (DB_PGBOUNCER=True).
+
+`manage.py benchmark_workers` measures throughput as the worker count grows.
+"""
+import os
+import decouple
+
+
+def cpu_count():
+    # CPUs this container may run on, not the whole host
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{decouple.config('PORT', default='8000')}"
+
+if decouple.config('SERVER_MODE', default='wsgi') == 'asgi':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    worker_class = 'gthread'
+    threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+
+workers = decouple.config(
+    'WEB_CONCURRENCY',
+    default=min(cpu_count() * 2 + 1, decouple.config('GUNICORN_MAX_WORKERS', default=8, cast=int)),
+    cast=int,
+)
+
+# Import Django once in the master: faster worker boots and shared memory
+# (on_starting below relies on it)
+preload_app = True
+
+# Health: workers that stop heartbeating for `timeout` seconds are killed and
+# replaced; the heartbeat file lives in memory so a slow disk can't stall it
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = 30
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+keepalive = 5
+
+# Recycle workers now and then so leaks can't build up; the jitter keeps
+# them from restarting all at once
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Django is loaded (preload_app) but nothing listens yet: apply pending
+    # migrations here rather than booting another interpreter for them, and
+    # load the URLconf once for all workers instead of on each first request
+    from django.core.management import call_command
+    from django.urls import get_resolver
+    call_command('migrate_if_needed')
+    get_resolver().url_patterns
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading must not be shared with the workers
+    from django.db import connections
+    connections.close_all()
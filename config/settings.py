@@ -1,5 +1,6 @@
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import dj_database_url
 import os
 from datetime import timedelta
@@ -20,11 +21,11 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     
     # Third-party
+    # simplejwt (auth class) and cloudinary (media storage) aren't apps here:
+    # installing them imports their models/template tags at every boot
     'rest_framework',
-    'rest_framework_simplejwt',  # Make sure this is here if you installed it
     'corsheaders',
     'django_filters',
-    'cloudinary',
     'cloudinary_storage',
 
     # Local Apps
@@ -35,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.health.HealthCheckMiddleware',
+    'core.instrumentation.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -65,11 +68,27 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
-
+ASGI_APPLICATION = 'config.asgi.application'
+
+# ASGI deployments (config/asgi.py turns this on) serve the public read
+# endpoints with async views
+SERVE_ASYNC = config('SERVE_ASYNC', default=False, cast=bool)
+if SERVE_ASYNC:
+    ROOT_URLCONF = 'config.urls_async'
+    # WhiteNoise is sync-only and would push every request back onto a
+    # thread; config/asgi.py mounts it for STATIC_URL only
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
+# Connections are reused across requests (per worker thread) and checked
+# before reuse, so one dropped by the server or a pooler isn't handed out.
+# Behind PgBouncer in transaction mode consecutive queries may run on
+# different server connections: server-side cursors (.iterator()) must be off.
 DATABASES = {
     'default': dj_database_url.config(
         default=config('DATABASE_URL'),
-        conn_max_age=600
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        conn_health_checks=True,
+        disable_server_side_cursors=config('DB_PGBOUNCER', default=False, cast=bool),
     )
 }
 
@@ -83,6 +102,9 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Collected at image build time (Dockerfile) with hashed names and a manifest
+if not DEBUG:
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -94,6 +116,10 @@ CLOUDINARY_STORAGE = {
 }
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# Image variants: 'thread' (local pool), 'sync', or dotted path to an enqueue(image_id) callable
+IMAGE_PIPELINE_RUNNER = config('IMAGE_PIPELINE_RUNNER', default='thread')
+IMAGE_PIPELINE_WORKERS = config('IMAGE_PIPELINE_WORKERS', default=2, cast=int)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -104,8 +130,18 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend', 'rest_framework.filters.SearchFilter', 'rest_framework.filters.OrderingFilter'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
+    # Token buckets per client IP for anonymous writes (see core/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'comments': config('THROTTLE_RATE_COMMENTS', default='5/min'),
+        'contact': config('THROTTLE_RATE_CONTACT', default='3/hour'),
+        'uploads': config('THROTTLE_RATE_UPLOADS', default='10/hour'),
+    },
 }
 
+# Proxies in front of the app that append to X-Forwarded-For (Railway's edge);
+# client IPs are read that many hops from the right. 0 uses REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=1, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -113,5 +149,54 @@ SIMPLE_JWT = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Cache: Redis, shared by every worker. The catalog cache, its generation
+# and the write throttles live here, so per-process memory is for
+# development only: with several workers each would keep its own (stale
+# pages after writes, throttles multiplied by the worker count)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif not DEBUG:
+    raise ImproperlyConfigured('REDIS_URL is required when DJANGO_DEBUG is off')
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached public catalog response stays valid (writes invalidate sooner)
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds between bulk writes of buffered mod view counts (0 disables the flusher)
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=10, cast=int)
+
+# Same for download link clicks
+DOWNLOAD_COUNT_FLUSH_INTERVAL = config('DOWNLOAD_COUNT_FLUSH_INTERVAL', default=10, cast=int)
+
+# Per-request query/timing metrics (Server-Timing header + JSON log line),
+# requests over the query budget are logged as warnings
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=False, cast=bool)
+REQUEST_QUERY_BUDGET = config('REQUEST_QUERY_BUDGET', default=10, cast=int)
+
+# Seconds /readyz waits for the database and cache before reporting 503
+HEALTH_CHECK_TIMEOUT = config('HEALTH_CHECK_TIMEOUT', default=2, cast=float)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.instrumentation': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
\ No newline at end of file
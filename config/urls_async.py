@@ -0,0 +1,16 @@
+"""
+URLconf for ASGI deployments (SERVE_ASYNC, set by config/asgi.py): the public
+read endpoints are served by async views, everything else falls through to
+the regular routes of config.urls.
+"""
+from django.urls import re_path
+from categories.async_views import category_detail, category_list
+from mods.async_views import mod_detail, mod_list
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    re_path(r'^api/mods/items/$', mod_list),
+    re_path(r'^api/mods/items/(?P<slug>[^/.]+)/$', mod_detail),
+    re_path(r'^api/categories/$', category_list),
+    re_path(r'^api/categories/(?P<pk>[0-9]+)/$', category_detail),
+] + sync_urlpatterns
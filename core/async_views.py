@@ -0,0 +1,141 @@
+"""
+Plumbing for the async (ASGI) read views, see config/urls_async.py.
+
+The async views reuse the DRF viewsets for everything that doesn't touch the
+database (querysets, filters, serializers, renderers) and fetch rows with
+the async ORM. Requests they don't serve natively (authenticated users,
+non-JSON formats, cursor pages, invalid input) are handed to the regular
+sync view in a thread, so both paths return the same responses.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework.exceptions import APIException
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from core.cache import aget_or_build, is_cacheable
+
+SYNC_URLCONF = 'config.urls'
+
+# Method -> action maps of the router's list and detail routes
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+
+class Delegate(Exception):
+    """Raised by an async view to let the sync view answer instead"""
+
+
+async def delegate(request):
+    """Run the view config.urls routes this request to, in a worker thread"""
+    try:
+        match = resolve(request.path_info, urlconf=SYNC_URLCONF)
+    except Resolver404:
+        raise Http404
+    request.resolver_match = match
+    return await sync_to_async(match.func)(request, *match.args, **match.kwargs)
+
+
+def build_view(viewset, request, actions, **kwargs):
+    """
+    A viewset instance set up like as_view(actions) would, or None when the
+    async path can't answer: only anonymous GETs negotiated to JSON are served.
+    """
+    if request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META:
+        return None
+    actions = {method: action for method, action in actions.items() if hasattr(viewset, action)}
+    # No authenticators: the request is anonymous, resolving the user needs no queries
+    drf_request = Request(request, authenticators=())
+    view = viewset(
+        action=actions['get'], action_map=actions, request=drf_request, format_kwarg=None, args=(), kwargs=kwargs
+    )
+    for method, action in actions.items():
+        setattr(view, method, getattr(view, action))
+    view.head = view.get
+    try:
+        renderer, media_type = view.perform_content_negotiation(drf_request)
+    except APIException:
+        return None
+    if not isinstance(renderer, JSONRenderer):
+        return None
+    drf_request.accepted_renderer, drf_request.accepted_media_type = renderer, media_type
+    return view
+
+
+def render(view, data, headers=None):
+    """Same bytes and headers the DRF Response for `data` would produce"""
+    request = view.request
+    renderer = request.accepted_renderer
+    content = renderer.render(data, request.accepted_media_type, {'view': view, 'request': request})
+    response = HttpResponse(content, content_type=request.accepted_media_type)
+    for name, value in {**view.default_response_headers, **(headers or {})}.items():
+        response[name] = value
+    return response
+
+
+async def acached_data(view, build):
+    """
+    (data, headers) of cached_response() for async views; build() is a
+    coroutine function returning the data
+    """
+    request = view.request
+    if not is_cacheable(request):
+        return await build(), {}
+    data, hit = await aget_or_build(request, build)
+    return data, {'X-Cache': 'HIT' if hit else 'MISS'}
+
+
+async def acached_response(view, build):
+    return render(view, *(await acached_data(view, build)))
+
+
+async def apaginate(view, queryset):
+    """
+    The page-number page of queryset, counted and fetched with the async ORM.
+    Leaves view.paginator ready for get_paginated_response().
+    """
+    pagination = view.paginator
+    pagination = getattr(pagination, 'page_number', pagination)  # SelectablePagination
+    if not isinstance(pagination, PageNumberPagination):
+        raise Delegate
+    request = view.request
+    pagination.request = request
+    paginator = pagination.django_paginator_class(queryset, pagination.get_page_size(request))
+    paginator.count = await queryset.acount()
+    try:
+        page = paginator.page(pagination.get_page_number(request, paginator))
+    except InvalidPage:
+        raise Delegate  # The sync view renders the 404
+    page.object_list = [obj async for obj in page.object_list]
+    pagination.page = page
+    return page.object_list
+
+
+async def alist(view, filter_in_thread=False):
+    """ListModelMixin.list() data for an async view"""
+    queryset = view.get_queryset()
+    if filter_in_thread:
+        queryset = await sync_to_async(view.filter_queryset)(queryset)
+    else:
+        queryset = view.filter_queryset(queryset)
+    objects = await apaginate(view, queryset)
+    serializer = view.get_serializer(objects, many=True)
+    return view.paginator.get_paginated_response(serializer.data).data
+
+
+async def aget_object(view, **lookup):
+    """GenericAPIView.get_object() for an async view (object permissions are AllowAny)"""
+    obj = await view.filter_queryset(view.get_queryset()).filter(**lookup).afirst()
+    if obj is None:
+        raise Delegate  # The sync view renders the 404
+    return obj
+
+
+async def serve(request, handler):
+    """Run handler() and fall back to the sync view on Delegate or an API error"""
+    try:
+        return await handler()
+    except (Delegate, APIException):
+        return await delegate(request)
@@ -0,0 +1,115 @@
+"""
+Response cache for the public catalog endpoints.
+
+Cached payloads are keyed by path + query params and a catalog "generation".
+Any write that changes what the catalog shows calls invalidate_catalog(),
+which bumps the generation so every older entry is simply never read again.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+GENERATION_KEY = 'catalog:generation'
+MODIFIED_KEY = 'catalog:modified'
+STATS_KEY = 'catalog:stats:{}'
+
+
+def catalog_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Time based so an evicted counter never restarts at an old value
+        cache.add(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def catalog_last_modified():
+    """When the catalog was last invalidated (or first seen by this cache)"""
+    modified = cache.get(MODIFIED_KEY)
+    if modified is None:
+        cache.add(MODIFIED_KEY, time.time(), timeout=None)
+        modified = cache.get(MODIFIED_KEY)
+    return datetime.fromtimestamp(modified, tz=timezone.utc)
+
+
+def invalidate_catalog():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        catalog_generation()
+    cache.set(MODIFIED_KEY, time.time(), timeout=None)
+
+
+def _count(outcome):
+    key = STATS_KEY.format(outcome)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def cache_stats():
+    return {
+        outcome: cache.get(STATS_KEY.format(outcome), 0)
+        for outcome in ('hits', 'misses')
+    }
+
+
+def response_cache_key(request):
+    raw = f'{request.path}?{sorted(request.query_params.lists())}'
+    return f'catalog:{catalog_generation()}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def is_cacheable(request):
+    return request.method == 'GET' and not request.user.is_staff
+
+
+def get_or_build(request, build):
+    """
+    Return (data, hit): the cached payload for this request, or the result of
+    build() which is stored for the next caller.
+    """
+    key = response_cache_key(request)
+    data = cache.get(key)
+    if data is not None:
+        _count('hits')
+        return data, True
+    _count('misses')
+    data = build()
+    cache.set(key, data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    return data, False
+
+
+async def aget_or_build(request, build):
+    """get_or_build() for async views; `build` is a coroutine function"""
+    # Plain cache calls: a local-memory or Redis GET is cheaper than the
+    # thread hop behind Django's async cache API
+    key = response_cache_key(request)
+    data = cache.get(key)
+    if data is not None:
+        _count('hits')
+        return data, True
+    _count('misses')
+    data = await build()
+    cache.set(key, data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    return data, False
+
+
+def cached_response(request, build):
+    """Response for build() data, served from the cache when the request allows it"""
+    if not is_cacheable(request):
+        return Response(build())
+    data, hit = get_or_build(request, build)
+    return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+
+class CachedListMixin:
+    """Serve `list` responses from the catalog cache"""
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return cached_response(request, lambda: parent.list(request, *args, **kwargs).data)
@@ -0,0 +1,42 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def _validators(request, version, last_modified):
+    raw = f'{request.get_full_path()}:{version}'
+    etag = f'W/"{hashlib.md5(raw.encode()).hexdigest()}"'
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def _set_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def conditional_response(request, version, last_modified, respond):
+    """
+    Answer If-None-Match / If-Modified-Since with a 304 before doing any work.
+
+    `version` is any value that changes whenever the representation does
+    (it is hashed into a weak ETag together with the full request path);
+    `respond` builds the real response only when the client copy is stale.
+    """
+    etag, timestamp = _validators(request, version, last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = respond()
+    return _set_validators(response, etag, timestamp)
+
+
+async def aconditional_response(request, version, last_modified, respond):
+    """conditional_response() for async views; `respond` is a coroutine function"""
+    etag, timestamp = _validators(request, version, last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await respond()
+    return _set_validators(response, etag, timestamp)
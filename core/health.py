@@ -0,0 +1,108 @@
+"""
+Health probes answered before the rest of the middleware stack runs (no
+sessions, CSRF, host validation or request metrics):
+
+- /healthz: the process is up and serving, touches nothing else
+- /readyz: the database and the cache answer within HEALTH_CHECK_TIMEOUT
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+
+# Checks run here so a hung database or cache can be timed out; a check
+# still stuck makes the next probes queue and time out too (not ready)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='readyz')
+
+
+def check_database():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        # Reconnect on the next probe
+        connection.close()
+        raise
+
+
+def check_cache():
+    cache.set('readyz', 1, 10)
+    if cache.get('readyz') != 1:
+        raise RuntimeError('cache did not return the value just set')
+
+
+CHECKS = {'database': check_database, 'cache': check_cache}
+
+
+def probe(response):
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def healthz(request):
+    return probe(JsonResponse({'status': 'ok'}))
+
+
+def report(futures, done):
+    results = {}
+    for name, future in futures.items():
+        if future not in done:
+            results[name] = 'timeout'
+        elif future.exception() is not None:
+            results[name] = f'error: {type(future.exception()).__name__}'
+        else:
+            results[name] = 'ok'
+    ready = all(result == 'ok' for result in results.values())
+    body = {'status': 'ok' if ready else 'unavailable', 'checks': results}
+    return probe(JsonResponse(body, status=200 if ready else 503))
+
+
+def readyz(request):
+    futures = {name: _executor.submit(check) for name, check in CHECKS.items()}
+    done, _ = wait(futures.values(), timeout=settings.HEALTH_CHECK_TIMEOUT)
+    return report(futures, done)
+
+
+async def areadyz(request):
+    """readyz() for the async chain: waits on the checks without holding a thread"""
+    futures = {name: _executor.submit(check) for name, check in CHECKS.items()}
+    waiting = {asyncio.wrap_future(future): future for future in futures.values()}
+    done, _ = await asyncio.wait(waiting, timeout=settings.HEALTH_CHECK_TIMEOUT)
+    return report(futures, {waiting[future] for future in done})
+
+
+PROBES = {'/healthz': healthz, '/readyz': readyz}
+
+
+class HealthCheckMiddleware:
+    """
+    Answers the probes itself; keep it first in MIDDLEWARE. Sync and async
+    capable, so under ASGI it doesn't push every request onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        probe_view = PROBES.get(request.path_info.rstrip('/'))
+        if probe_view is not None:
+            return probe_view(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        probe_view = PROBES.get(request.path_info.rstrip('/'))
+        if probe_view is readyz:
+            return await areadyz(request)
+        if probe_view is not None:
+            return probe_view(request)
+        return await self.get_response(request)
@@ -0,0 +1,170 @@
+"""
+Per-request metrics: SQL query count and time, serializer time and total
+latency, sent back as a Server-Timing header and logged as one JSON line.
+
+Off unless REQUEST_METRICS_ENABLED. When disabled the middleware drops out of
+the stack (MiddlewareNotUsed), and neither DRF's serializers nor the database
+connections are wrapped, so it costs nothing per request; serializers outside DRF's hierarchy time their own
+`data` with timed_data(), a context variable lookup when off.
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters for one request; also times its queries (see count_queries)"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def timed_data(data):
+    """`data` property counted as serializer time of the current request"""
+    def timed(self):
+        metrics = _current.get()
+        # Nested serializers (e.g. comments inside a mod) count toward the outer one
+        if metrics is None or metrics.serializer_depth:
+            return data(self)
+        metrics.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return data(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializer_depth -= 1
+    timed.instrumented = True
+    return property(timed)
+
+
+def instrument_serializers():
+    """Time every top-level `serializer.data` (including the queries it triggers)"""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        data = cls.__dict__['data'].fget
+        if not getattr(data, 'instrumented', False):
+            cls.data = timed_data(data)
+
+
+def ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper on every connection, counting toward the measured request if any"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(sender=None, connection=None, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def instrument_connections():
+    """
+    Count queries on every connection, whichever thread opens it: the async
+    views run theirs through sync_to_async, on connections of other threads
+    """
+    connection_created.connect(instrument_connection, dispatch_uid='request_metrics')
+    for conn in connections.all(initialized_only=True):
+        instrument_connection(connection=conn)
+
+
+@contextmanager
+def measure():
+    """RequestMetrics of the queries and serializers run within the block"""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    Sync and async capable, so enabling metrics under ASGI doesn't push
+    every request onto a thread. Code the async views run through
+    sync_to_async shares the request's context, and with it its metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget = settings.REQUEST_QUERY_BUDGET
+        instrument_serializers()
+        instrument_connections()
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with measure() as metrics:
+            response = self.get_response(request)
+        self.report(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with measure() as metrics:
+            response = await self.get_response(request)
+        self.report(request, response, metrics, time.perf_counter() - start)
+        return response
+
+    def report(self, request, response, metrics, total):
+        timings = [
+            f'db;dur={ms(metrics.db_time)};desc="{metrics.queries} queries"',
+            f'serialize;dur={ms(metrics.serializer_time)}',
+            f'total;dur={ms(total)}',
+        ]
+        if response.has_header('Server-Timing'):
+            timings.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': ms(metrics.db_time),
+            'serializer_ms': ms(metrics.serializer_time),
+            'total_ms': ms(total),
+        }
+        if metrics.queries > self.query_budget:
+            record['over_query_budget'] = True
+            logger.warning(json.dumps(record), extra={'metrics': record})
+        else:
+            logger.info(json.dumps(record), extra={'metrics': record})
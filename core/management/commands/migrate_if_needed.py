@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+
+class Command(BaseCommand):
+    help = 'Run migrate only when there are unapplied migrations (a cheap no-op on boot otherwise)'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        executor = MigrationExecutor(connections[options['database']])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan:
+            self.stdout.write('No migrations to apply.')
+            return
+        self.stdout.write(f'{len(plan)} migration(s) to apply.')
+        call_command('migrate', database=options['database'], interactive=False, verbosity=options['verbosity'])
@@ -0,0 +1,111 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: time each startup phase up to the first response
+PROBE = '''
+import json, os, sys, time
+start = time.perf_counter()
+marks = {}
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+marks['settings'] = time.perf_counter()
+django.setup(set_prefix=False)
+marks['apps'] = time.perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+application = WSGIHandler()
+marks['middleware'] = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+marks['urls'] = time.perf_counter()
+statuses = []
+def start_response(status, headers, exc_info=None):
+    statuses.append(int(status.split()[0]))
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '80', 'wsgi.url_scheme': 'http', 'wsgi.input': __import__('io').BytesIO(),
+    'wsgi.errors': sys.stderr,
+}
+b''.join(application(environ, start_response))
+marks['first_request'] = time.perf_counter()
+previous, phases = start, {}
+for name, mark in marks.items():
+    phases[name] = (mark - previous) * 1000
+    previous = mark
+phases['total'] = (previous - start) * 1000
+print(json.dumps({'phases': phases, 'status': statuses[0]}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the app in fresh interpreters and report time to first request by phase (settings, '
+        'apps, middleware, URLconf, first request) and import time per installed app'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/categories/', help='Path of the first request')
+        parser.add_argument('--runs', type=int, default=3, help='Startups to take the median of')
+        parser.add_argument('--top', type=int, default=15, help='Packages to list')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        runs = [self.startup(options['path']) for _ in range(options['runs'])]
+        phases = {
+            name: statistics.median(run['phases'][name] for run in runs) for name in runs[0]['phases']
+        }
+        # Import times vary less than wall time but still; keep the median run's
+        imports = sorted(runs, key=lambda run: run['phases']['total'])[len(runs) // 2]['imports']
+        report = {'path': options['path'], 'status': runs[0]['status'], 'phases': phases, 'imports': imports}
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report, options['top'])
+
+    def startup(self, path):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        run['imports'] = self.import_times(result.stderr)
+        return run
+
+    def import_times(self, log):
+        """Milliseconds of imports (self time) grouped by installed app, other modules by package"""
+        owners = sorted((config.name for config in apps.get_app_configs()), key=len, reverse=True)
+        totals = defaultdict(float)
+        for line in log.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            own, _, module = line[len('import time:'):].split('|')
+            module = module.strip()
+            if not own.strip().isdigit():
+                continue  # The header line
+            owner = next(
+                (name for name in owners if module == name or module.startswith(name + '.')),
+                module.split('.')[0],
+            )
+            totals[owner] += int(own) / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def print_report(self, report, top):
+        self.stdout.write(f"Time to first request ({report['path']} -> {report['status']}):")
+        for name, elapsed in report['phases'].items():
+            self.stdout.write(f'  {name:<15}{elapsed:>9.1f} ms')
+        apps_names = {config.name for config in apps.get_app_configs()}
+        self.stdout.write('Import time (self) by app / package:')
+        for name, elapsed in list(report['imports'].items())[:top]:
+            marker = '' if name in apps_names else '  (not an app)'
+            self.stdout.write(f'  {name:<35}{elapsed:>9.1f} ms{marker}')
@@ -0,0 +1,87 @@
+import re
+from functools import reduce
+from itertools import count
+from operator import or_
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+# Collisions with a concurrent writer are retried this many times
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def claim(taken, slug):
+    """
+    Record slug in {base: used suffixes} under every base it can belong to:
+    itself (suffix 0) and, for "x-N", base x (suffix N) -- "a-1" is both
+    the bare "a-1" and suffix 1 of "a"
+    """
+    taken.setdefault(slug, set()).add(0)
+    match = re.fullmatch(r'(.+)-(\d+)', slug)
+    if match:
+        taken.setdefault(match.group(1), set()).add(int(match.group(2)))
+
+
+def taken_suffixes(model, bases, field='slug'):
+    """
+    {base: set of used suffixes} for every base in one query, where the bare
+    base counts as suffix 0 and "base-N" as N.
+    """
+    bases = set(bases)
+    if not bases:
+        return {}
+    lookup = reduce(or_, [Q(**{field: base}) | Q(**{f'{field}__startswith': f'{base}-'}) for base in bases])
+    taken = {base: set() for base in bases}
+    for slug in model.objects.filter(lookup).order_by().values_list(field, flat=True):
+        claim(taken, slug)
+    return taken
+
+
+def allocate_slugs(model, bases, field='slug'):
+    """Unique slugs for a batch of base slugs (duplicates within the batch included)"""
+    taken = taken_suffixes(model, bases, field)
+    slugs = []
+    for base in bases:
+        used = taken.get(base, set())
+        # The bare base first, then the smallest free suffix: not one past the
+        # highest, which for "scania" after "scania-2009" would be 2010
+        suffix = next(n for n in count() if n not in used)
+        slug = f'{base}-{suffix}' if suffix else base
+        # Claimed for every base it can clash with, later ones in the batch included
+        claim(taken, slug)
+        slugs.append(slug)
+    return slugs
+
+
+def save_with_unique_slug(instance, base, save, field='slug'):
+    """
+    Give instance the next free slug for base and run save(). Rather than
+    locking, a unique-constraint clash with a concurrent insert just picks
+    the following suffix and tries again.
+    """
+    model = type(instance)
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        setattr(instance, field, allocate_slugs(model, [base], field)[0])
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
+
+
+def create_with_unique_slugs(instances, bases, create, field='slug'):
+    """
+    save_with_unique_slug() for a batch: slug every instance from its base
+    and run create() (e.g. a bulk_create), picking fresh slugs on a clash
+    with a concurrent insert
+    """
+    model = type(instances[0])
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        for instance, slug in zip(instances, allocate_slugs(model, bases, field)):
+            setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return create()
+        except IntegrityError:
+            if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
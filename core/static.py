@@ -0,0 +1,39 @@
+"""
+Static files under ASGI (config/asgi.py). WhiteNoise only ships WSGI
+middleware, so its WSGI app is mounted for STATIC_URL alone: the same
+STATIC_ROOT, hashed names and cache headers as under gunicorn's WSGI
+workers, while every other request stays on the async Django app.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+def not_found(environ, start_response):
+    start_response('404 Not Found', [('Content-Type', 'text/plain; charset=utf-8')])
+    return [b'Not Found']
+
+
+class WSGIStaticFiles(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware's settings and files as WhiteNoise's plain WSGI app"""
+    __call__ = WhiteNoise.__call__
+    serve = staticmethod(WhiteNoise.serve)
+
+    def __init__(self):
+        super().__init__()
+        self.application = not_found
+
+
+class StaticFilesApp:
+    """ASGI app serving STATIC_URL with WhiteNoise and passing the rest to application"""
+
+    def __init__(self, application):
+        self.application = application
+        files = WSGIStaticFiles()
+        self.prefix = files.static_prefix
+        self.static = WsgiToAsgi(files)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'].startswith(self.prefix):
+            return await self.static(scope, receive, send)
+        return await self.application(scope, receive, send)
@@ -1,3 +1,228 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+from asgiref.sync import SyncToAsync, iscoroutinefunction
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from categories.models import Category
+from mods.models import Mod
+from . import health
+from .models import ContactMessage
+from .static import StaticFilesApp
+from .throttling import client_ip
 
-# Create your tests here.
+
+class ClientIpTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def ip(self, forwarded=None):
+        extra = {'HTTP_X_FORWARDED_FOR': forwarded} if forwarded is not None else {}
+        return client_ip(self.factory.get('/', REMOTE_ADDR='10.0.0.1', **extra))
+
+    def test_reads_address_appended_by_proxy(self):
+        self.assertEqual(self.ip('203.0.113.7'), '203.0.113.7')
+        self.assertEqual(self.ip(), '10.0.0.1')
+
+    def test_ignores_spoofed_forwarded_addresses(self):
+        # The client sent "X-Forwarded-For: 198.51.100.1", the proxy appended its address
+        self.assertEqual(self.ip('198.51.100.1, 203.0.113.7'), '203.0.113.7')
+
+    @override_settings(TRUSTED_PROXY_COUNT=2)
+    def test_counts_hops_from_the_right(self):
+        self.assertEqual(self.ip('198.51.100.1, 203.0.113.7, 10.0.0.2'), '203.0.113.7')
+        self.assertEqual(self.ip('203.0.113.7'), '10.0.0.1')
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_no_proxy_uses_remote_addr(self):
+        self.assertEqual(self.ip('203.0.113.7'), '10.0.0.1')
+
+
+class ContactThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_contact_flood_is_cut_off_after_burst(self):
+        payload = {'name': 'Spam', 'email': 'spam@example.com', 'message': 'buy'}
+        statuses = [self.client.post('/api/contact/', payload).status_code for _ in range(30)]
+        self.assertEqual(statuses.count(201), 3)
+        self.assertEqual(statuses.count(429), 27)
+        self.assertEqual(ContactMessage.objects.count(), 3)
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_QUERY_BUDGET=10)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Trucks')
+
+    def get_logged(self, level='INFO', path='/api/categories/', **extra):
+        with self.assertLogs('core.instrumentation', level) as logs:
+            response = self.client.get(path, **extra)
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_reports_queries_and_timings(self):
+        response, record = self.get_logged()
+        timing = response['Server-Timing']
+        self.assertIn(f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"', timing)
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.assertEqual(record['view'], 'category-list')
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['serializer_ms'], 0)
+        self.assertNotIn('over_query_budget', record)
+
+    @override_settings(REQUEST_QUERY_BUDGET=20, VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_times_row_serializers(self):
+        Mod.objects.create(title='Scania', description='desc', category=self.category, status='published')
+        response, record = self.get_logged(path='/api/mods/items/scania/')
+        self.assertEqual(record['view'], 'mod-detail')
+        self.assertGreater(record['serializer_ms'], 0)
+        self.assertIn(f'serialize;dur={record["serializer_ms"]}', response['Server-Timing'])
+
+    def test_async_chain_stays_async(self):
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(MIDDLEWARE=middleware):
+            chain = ASGIHandler()._middleware_chain
+        self.assertNotIsInstance(chain, SyncToAsync)
+        self.assertTrue(iscoroutinefunction(chain))
+
+    @override_settings(REQUEST_QUERY_BUDGET=20, VIEW_COUNT_FLUSH_INTERVAL=0)
+    async def test_measures_async_views(self):
+        await Mod.objects.acreate(title='Scania', description='desc', category=self.category, status='published')
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF='config.urls_async'), \
+                self.assertLogs('core.instrumentation', 'INFO') as logs:
+            response = await self.async_client.get('/api/mods/items/scania/')
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['serializer_ms'], 0)
+        self.assertIn(f'{record["queries"]} queries', response['Server-Timing'])
+
+    @override_settings(REQUEST_QUERY_BUDGET=0)
+    def test_flags_requests_over_query_budget(self):
+        _, record = self.get_logged(level='WARNING')
+        self.assertTrue(record['over_query_budget'])
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_disabled_middleware_drops_out(self):
+        self.assertFalse(self.client.get('/api/categories/').has_header('Server-Timing'))
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, HEALTH_CHECK_TIMEOUT=1)
+class HealthCheckTests(TestCase):
+    def test_liveness_skips_middleware_and_database(self):
+        with self.assertNumQueries(0), self.assertNoLogs('core.instrumentation'):
+            response = self.client.get('/healthz', HTTP_HOST='internal.probe')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertNotIn('Server-Timing', response)
+        self.assertFalse(response.cookies)
+
+    def test_readiness_checks_database_and_cache(self):
+        response = self.client.get('/readyz/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok', 'checks': {'database': 'ok', 'cache': 'ok'}})
+
+    def test_unreachable_database_is_not_ready(self):
+        # The check runs on its own thread (and connection): patch them all
+        with mock.patch.object(type(connections['default']), 'cursor', side_effect=OperationalError):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks'], {'database': 'error: OperationalError', 'cache': 'ok'})
+
+    @override_settings(HEALTH_CHECK_TIMEOUT=0.05)
+    def test_hung_cache_times_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with mock.patch.dict(health.CHECKS, cache=release.wait):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'status': 'unavailable', 'checks': {'database': 'ok', 'cache': 'timeout'}})
+
+    def test_async_chain_stays_async(self):
+        # No sync-only middleware left in front: requests aren't handed to a thread
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(MIDDLEWARE=middleware, REQUEST_METRICS_ENABLED=False):
+            chain = ASGIHandler()._middleware_chain
+        self.assertNotIsInstance(chain, SyncToAsync)
+        self.assertTrue(iscoroutinefunction(chain))
+
+    async def test_async_probes(self):
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(MIDDLEWARE=middleware, REQUEST_METRICS_ENABLED=False):
+            live = await self.async_client.get('/healthz')
+            ready = await self.async_client.get('/readyz')
+        self.assertEqual(live.json(), {'status': 'ok'})
+        self.assertEqual(ready.json(), {'status': 'ok', 'checks': {'database': 'ok', 'cache': 'ok'}})
+
+
+class StaticFilesAppTests(SimpleTestCase):
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        # What collectstatic leaves with the manifest storage: hashed names only
+        os.makedirs(os.path.join(root.name, 'admin', 'css'))
+        with open(os.path.join(root.name, 'admin', 'css', 'base.523eb49842a7.css'), 'w') as f:
+            f.write('body {}')
+        settings_override = override_settings(STATIC_ROOT=root.name, DEBUG=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        async def django_app(scope, receive, send):
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'django'})
+        self.app = StaticFilesApp(django_app)
+
+    async def get(self, path):
+        scope = {
+            'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http', 'path': path,
+            'raw_path': path.encode(), 'root_path': '', 'query_string': b'', 'headers': [],
+            'server': ('testserver', 80),
+        }
+        communicator = ApplicationCommunicator(self.app, scope)
+        await communicator.send_input({'type': 'http.request', 'body': b''})
+        start = await communicator.receive_output()
+        body = await communicator.receive_output()
+        return start['status'], dict(start['headers']), body['body']
+
+    async def test_serves_collected_files_from_static_root(self):
+        status, headers, body = await self.get('/static/admin/css/base.523eb49842a7.css')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b'body {}')
+        self.assertIn(b'max-age', headers[b'cache-control'])
+
+    async def test_missing_static_file_is_not_found(self):
+        status, _, _ = await self.get('/static/admin/css/base.css')
+        self.assertEqual(status, 404)
+
+    async def test_other_paths_reach_django(self):
+        status, _, body = await self.get('/api/categories/')
+        self.assertEqual((status, body), (200, b'django'))
+
+
+class MigrateIfNeededTests(TestCase):
+    def test_current_schema_is_a_no_op(self):
+        out = StringIO()
+        with mock.patch('core.management.commands.migrate_if_needed.call_command') as migrate:
+            call_command('migrate_if_needed', stdout=out)
+        migrate.assert_not_called()
+        self.assertEqual(out.getvalue().strip(), 'No migrations to apply.')
+
+    def test_pending_migrations_are_applied(self):
+        out = StringIO()
+        with mock.patch('django.db.migrations.executor.MigrationExecutor.migration_plan', return_value=[object()]), \
+                mock.patch('core.management.commands.migrate_if_needed.call_command') as migrate:
+            call_command('migrate_if_needed', stdout=out)
+        migrate.assert_called_once_with('migrate', database='default', interactive=False, verbosity=1)
+        self.assertIn('1 migration(s) to apply.', out.getvalue())
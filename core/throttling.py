@@ -0,0 +1,78 @@
+"""
+Per-client throttling for the anonymous write endpoints.
+
+Each (scope, client IP) pair gets a token bucket stored in the cache. A rate
+of "N/period" in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] allows bursts of N
+requests and refills N tokens per period, so a flood is cut off after the
+burst and then admitted at the steady rate only.
+"""
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Serializes the read-modify-write within a process only: the cache get/set
+# isn't atomic, so workers racing on one bucket can spend the same token and
+# a flood spread over several workers gets a little past the limit
+_bucket_lock = threading.Lock()
+
+
+def client_ip(request):
+    """
+    Each of the TRUSTED_PROXY_COUNT proxies in front of the app appends the
+    address it got the request from to X-Forwarded-For, so the client is that
+    many hops from the right; anything further left is the client's to forge
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    if proxies and len(hops) >= proxies:
+        return hops[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttles unsafe methods of non-staff clients per view `throttle_scope`"""
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_rate(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        return scope, rate
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS or request.user.is_staff:
+            return True
+        scope, rate = self.get_rate(view)
+        if rate is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        key = f'throttle:{scope}:{client_ip(request)}'
+        with _bucket_lock:
+            now = time.time()
+            tokens, stamp = cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * capacity / period)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                self.retry_after = (1 - tokens) * period / capacity
+            # An untouched bucket is full again after one period
+            cache.set(key, (tokens, now), timeout=period)
+        return allowed
+
+    def wait(self):
+        return self.retry_after
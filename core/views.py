@@ -2,6 +2,7 @@ from rest_framework import viewsets, mixins
 from rest_framework.permissions import AllowAny
 from .models import ContactMessage
 from .serializers import ContactMessageSerializer
+from .throttling import TokenBucketThrottle
 
 class ContactViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     """
@@ -9,4 +10,6 @@ class ContactViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     """
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
-    permission_classes = [AllowAny] # Allow anyone to submit a contact form
\ No newline at end of file
+    permission_classes = [AllowAny] # Allow anyone to submit a contact form
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'contact'
\ No newline at end of file
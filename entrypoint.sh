@@ -3,11 +3,14 @@
 # Stop on error
 set -e
 
-echo "Applying database migrations..."
-python manage.py migrate
+# Static files are collected when the image is built (Dockerfile) and
+# pending migrations are applied by gunicorn on start (config/gunicorn.py)
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+if [ "$SERVER_MODE" = "asgi" ]; then
+    APP=config.asgi:application
+else
+    APP=config.wsgi:application
+fi
 
-echo "Starting Gunicorn..."
-gunicorn config.wsgi:application --bind 0.0.0.0:$PORT
\ No newline at end of file
+echo "Starting Gunicorn ($APP)..."
+exec gunicorn -c config/gunicorn.py $APP
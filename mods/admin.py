@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Mod, DownloadLink, ModImage, Comment
+from core.cache import invalidate_catalog
+from .models import Mod, DownloadLink, ModImage, Comment, DLC, GameVersion
 
 class DownloadLinkInline(admin.TabularInline):
     model = DownloadLink
@@ -17,16 +18,28 @@ class ModAdmin(admin.ModelAdmin):
     inlines = [DownloadLinkInline, ModImageInline]
     actions = ['approve_mods', 'reject_mods']
     prepopulated_fields = {"slug": ("title",)}
+    filter_horizontal = ('required_dlcs', 'conflicts_with')
 
     @admin.action(description='Approve selected mods (Publish)')
     def approve_mods(self, request, queryset):
         queryset.update(status='published')
+        # Queryset updates skip Mod.save, so drop cached catalog pages here
+        invalidate_catalog()
 
     @admin.action(description='Reject selected mods (Delete)')
     def reject_mods(self, request, queryset):
         # Actually delete them to clear database
         queryset.delete()
 
+@admin.register(DLC)
+class DLCAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+
+@admin.register(GameVersion)
+class GameVersionAdmin(admin.ModelAdmin):
+    list_display = ('version', 'released_at')
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('user_name', 'mod', 'created_at')
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ModsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mods'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,70 @@
+"""
+Async versions of ModViewSet.list / retrieve for ASGI deployments
+(see core/async_views.py and config/urls_async.py).
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from core.async_views import (
+    DETAIL_ACTIONS, LIST_ACTIONS, acached_data, acached_response, aget_object, alist, build_view, delegate,
+    render, serve,
+)
+from core.cache import catalog_generation, catalog_last_modified
+from core.conditional import aconditional_response
+from . import search
+from .counters import overlay_live_counts, view_counter
+from .views import ModViewSet
+
+
+def filters_query_database(request):
+    """Whether ModFilter runs queries of its own, which can't happen on the event loop"""
+    # The SQLite search fallback may build its index from the database
+    # first; game_version looks up the compatible GameVersion rows
+    searches = not search.uses_postgres() and bool(request.GET.get('search') or request.GET.get('q'))
+    return searches or 'game_version' in request.GET
+
+
+async def mod_list(request):
+    view = build_view(ModViewSet, request, LIST_ACTIONS)
+    cursor = 'cursor' in request.GET or request.GET.get('pagination') == 'cursor'
+    if view is None or cursor:
+        return await delegate(request)
+
+    async def respond():
+        return await acached_response(view, lambda: alist(view, filter_in_thread=filters_query_database(request)))
+
+    return await serve(request, lambda: aconditional_response(
+        request, (catalog_generation(), False), catalog_last_modified(), respond,
+    ))
+
+
+async def mod_detail(request, slug):
+    view = build_view(ModViewSet, request, DETAIL_ACTIONS, slug=slug)
+    if view is None or filters_query_database(request):
+        return await delegate(request)
+
+    state = await (
+        view.get_visible_queryset()
+        .filter(slug=slug)
+        .values('id', 'updated_at', 'view_count', 'download_count')
+        .annotate(last_comment=Max('comments__created_at'), comments=Count('comments'))
+        .afirst()
+    )
+    if state is None:
+        return await delegate(request)
+
+    view_counter.record(state['id'])
+    last_modified = max(filter(None, [state['updated_at'], state['last_comment']]))
+    version = (
+        state['updated_at'], state['last_comment'], state['comments'], state['view_count'], state['download_count']
+    )
+
+    async def build():
+        mod = await aget_object(view, slug=slug)
+        # The row serializer queries the nested relations itself
+        return await sync_to_async(lambda: view.get_serializer(mod).data)()
+
+    async def respond():
+        data, headers = await acached_data(view, build)
+        return render(view, overlay_live_counts(data, state), headers)
+
+    return await serve(request, lambda: aconditional_response(request, version, last_modified, respond))
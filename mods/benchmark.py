@@ -0,0 +1,225 @@
+"""
+Helpers shared by the benchmark management commands: seeding a synthetic
+catalog in bulk, driving endpoints at a fixed concurrency and summarising
+latency samples.
+"""
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from django.db import connection, connections, models
+from django.test import AsyncClient, Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.utils import timezone
+from categories.models import Category
+from .models import Comment, DownloadLink, Mod, ModImage, GameVersion
+
+TITLE_WORDS = [
+    'Scania', 'Volvo', 'DAF', 'MAN', 'Iveco', 'Renault', 'Mercedes', 'Kenworth',
+    'Trailer', 'Map', 'Sound', 'Tuning', 'Skin', 'Interior', 'Lights', 'Physics',
+]
+
+
+@contextmanager
+def throwaway_database(file_name=None, **overrides):
+    """
+    Run the block against a freshly created test database with `overrides`
+    applied to the settings, destroying it afterwards. `file_name` keeps a
+    SQLite test database in a temporary file instead of memory, for
+    benchmarks whose threads or server processes must share it.
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    if file_name and connection.vendor == 'sqlite':
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.gettempdir(), file_name)
+    try:
+        with override_settings(**overrides):
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                yield
+            finally:
+                connections.close_all()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        teardown_test_environment()
+
+
+def seed_catalog(mods=1000, categories=10, published_ratio=0.8, batch_size=2000, seed=42,
+                 images=0, links=0, comments=0):
+    """
+    Bulk insert a synthetic catalog and return the created categories.
+    `images`, `links` and `comments` are per mod.
+    """
+    rng = random.Random(seed)
+    cats = Category.objects.bulk_create(
+        [Category(name=f'Category {i}', slug=f'bench-category-{i}') for i in range(categories)]
+    )
+    versions = GameVersion.objects.bulk_create(
+        [GameVersion(version=f'1.{minor}') for minor in range(40, 51)]
+    )
+    now = timezone.now()
+    batch = []
+    for i in range(mods):
+        title = ' '.join(rng.sample(TITLE_WORDS, 3))
+        rating_count = rng.randint(0, 50)
+        rating_sum = rng.randint(rating_count, rating_count * 5)
+        batch.append(Mod(
+            title=title,
+            slug=f'bench-{i}',
+            category=rng.choice(cats),
+            description=f'{title} for ETS2. ' * 5,
+            uploader_name=f'uploader{rng.randint(1, 500)}',
+            version=f'1.{rng.randint(0, 50)}',
+            min_game_version=rng.choice(versions),
+            status='published' if rng.random() < published_ratio else rng.choice(['pending', 'rejected']),
+            view_count=rng.randint(0, 100000),
+            rating_count=rating_count,
+            rating_sum=rating_sum,
+            average_rating=round(rating_sum / rating_count, 1) if rating_count else 0.0,
+        ))
+        if len(batch) >= batch_size:
+            Mod.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Mod.objects.bulk_create(batch)
+    # auto_now_add stamps every row with "now"; spread creation dates out in
+    # small chunks so the created_at orderings have something to sort
+    ids = list(Mod.objects.filter(slug__startswith='bench-').values_list('id', flat=True))
+    rng.shuffle(ids)
+    for start in range(0, len(ids), 100):
+        Mod.objects.filter(id__in=ids[start:start + 100]).update(
+            created_at=now - timedelta(minutes=start)
+        )
+    if images or links or comments:
+        seed_relations(ids, images, links, comments, batch_size, rng)
+    analyze()
+    return cats
+
+
+def seed_relations(mod_ids, images, links, comments, batch_size, rng):
+    """Images (first one is the cover), download links and unrated comments for every mod"""
+    rows = []
+    for mod_id in mod_ids:
+        rows += [
+            ModImage(mod_id=mod_id, image=f'mod_images/bench/{mod_id}-{i}.jpg', is_cover=i == 0)
+            for i in range(images)
+        ]
+        rows += [
+            DownloadLink(mod_id=mod_id, name=f'Mirror {i}', url=f'https://example.com/{mod_id}/{i}.zip', file_size='100 MB')
+            for i in range(links)
+        ]
+        rows += [
+            Comment(mod_id=mod_id, user_name=f'user{rng.randint(1, 500)}', content='Works fine on 1.50')
+            for _ in range(comments)
+        ]
+    for model in (ModImage, DownloadLink, Comment):
+        model.objects.bulk_create([row for row in rows if isinstance(row, model)], batch_size=batch_size)
+    if images:
+        # bulk_create skips ModImage.save, so point the covers in one UPDATE
+        cover = ModImage.objects.filter(mod=models.OuterRef('pk'), is_cover=True)
+        Mod.objects.filter(pk__in=mod_ids).update(cover_image=models.Subquery(cover.values('pk')[:1]))
+
+
+def analyze():
+    """Refresh planner statistics so freshly seeded tables use their indexes"""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def time_calls(fn, runs):
+    """Call fn `runs` times and return the latencies in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_load(make_request, requests, concurrency):
+    """
+    Send `requests` calls of make_request(client, i) from `concurrency` threads,
+    each with its own test client and database connection. Returns latency
+    percentiles, throughput, error and per-request query counts.
+    """
+    def worker(indices):
+        client = Client()
+        results = []
+        try:
+            for i in indices:
+                # The query log is a capped deque; start every request empty
+                connection.queries_log.clear()
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    response = make_request(client, i)
+                    elapsed = (time.perf_counter() - start) * 1000
+                results.append((elapsed, len(ctx.captured_queries), response.status_code))
+        finally:
+            connection.close()
+        return results
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        chunks = pool.map(worker, [range(w, requests, concurrency) for w in range(concurrency)])
+        results = [result for chunk in chunks for result in chunk]
+    wall = time.perf_counter() - start
+
+    queries = [count for _, count, _ in results]
+    return {
+        'requests': len(results),
+        'errors': sum(1 for *_, status in results if status >= 400),
+        'throughput': len(results) / wall if wall else 0.0,
+        **summarize([elapsed for elapsed, _, _ in results]),
+        'queries_mean': statistics.fmean(queries) if queries else 0.0,
+        'queries_max': max(queries, default=0),
+    }
+
+
+def run_async_load(make_request, requests, concurrency):
+    """
+    Send `requests` calls of `await make_request(client, i)` from one event
+    loop with up to `concurrency` in flight. Latency includes the time a
+    request waited for a free slot. Returns the stats run_load() does,
+    without query counts.
+    """
+    async def main():
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            start = time.perf_counter()
+            async with slots:
+                response = await make_request(client, i)
+            return (time.perf_counter() - start) * 1000, response.status_code
+
+        return await asyncio.gather(*(one(i) for i in range(requests)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    wall = time.perf_counter() - start
+    return {
+        'requests': len(results),
+        'errors': sum(1 for _, status in results if status >= 400),
+        'throughput': len(results) / wall if wall else 0.0,
+        **summarize([elapsed for elapsed, _ in results]),
+    }
+
+
+def summarize(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p50': value, 'p95': value, 'p99': value, 'mean': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'p50': cuts[49],
+        'p95': cuts[94],
+        'p99': cuts[98],
+        'mean': statistics.fmean(samples),
+    }
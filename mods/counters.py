@@ -0,0 +1,157 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def increment_by(field, counts, key='pk'):
+    """F(field) + a CASE picking each row's count from {key value: count}"""
+    return models.F(field) + models.Case(
+        *[models.When(**{key: value}, then=models.Value(count)) for value, count in counts.items()],
+        output_field=models.PositiveIntegerField(),
+    )
+
+
+class CounterBuffer:
+    """
+    Accumulates increments in process memory and writes them in bulk (from a
+    background thread every `interval_setting` seconds), so hot endpoints
+    never touch the counted rows.
+    """
+    interval_setting = None
+
+    def __init__(self):
+        self._pending = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def _add(self, key):
+        with self._lock:
+            self._pending[key] += 1
+            count = self._pending[key]
+        self._ensure_flusher()
+        return count
+
+    def _get(self, key):
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def write(self, pending):
+        """Persist {key: count}; returns the number of rows updated"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Write all buffered increments. Returns the number of rows updated."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+        if not pending:
+            return 0
+
+        try:
+            with transaction.atomic():
+                return self.write(pending)
+        except Exception:
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                for key, count in pending.items():
+                    self._pending[key] += count
+            raise
+
+    def _ensure_flusher(self):
+        interval = getattr(settings, self.interval_setting, None)
+        if not interval or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, args=(interval,), name=f'{type(self).__name__}-flusher', daemon=True
+            )
+            self._flusher.start()
+
+    def flush_in_background(self):
+        """flush() for callers nobody reports to: the flusher thread and exit"""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Failed to flush %s', type(self).__name__)
+        finally:
+            close_old_connections()
+
+    def _run_flusher(self, interval):
+        while True:
+            time.sleep(interval)
+            self.flush_in_background()
+
+
+class ViewCountBuffer(CounterBuffer):
+    """Mod detail views -> Mod.view_count, so detail hits never write"""
+    interval_setting = 'VIEW_COUNT_FLUSH_INTERVAL'
+
+    def record(self, mod_id):
+        """Buffer one view. Returns the number of views still pending for this mod."""
+        return self._add(mod_id)
+
+    def pending(self, mod_id):
+        return self._get(mod_id)
+
+    def write(self, pending):
+        from .models import Mod
+        from .ranking import record_events
+
+        updated = Mod.objects.filter(pk__in=pending.keys()).update(view_count=increment_by('view_count', pending))
+        # Same batch feeds the trending buckets
+        record_events('views', pending)
+        return updated
+
+
+class DownloadCountBuffer(CounterBuffer):
+    """Download redirects -> DownloadLink.click_count and Mod.download_count"""
+    interval_setting = 'DOWNLOAD_COUNT_FLUSH_INTERVAL'
+
+    def record(self, link_id, mod_id):
+        return self._add((link_id, mod_id))
+
+    def pending(self, mod_id):
+        """Downloads of the mod (all its links) not written yet"""
+        with self._lock:
+            return sum(count for (_, key), count in self._pending.items() if key == mod_id)
+
+    def write(self, pending):
+        from .models import DownloadLink, Mod
+        from .ranking import record_events
+
+        per_link, per_mod = {}, defaultdict(int)
+        for (link_id, mod_id), count in pending.items():
+            per_link[link_id] = count
+            per_mod[mod_id] += count
+        updated = DownloadLink.objects.filter(pk__in=per_link.keys()).update(
+            click_count=increment_by('click_count', per_link)
+        )
+        Mod.objects.filter(pk__in=per_mod.keys()).update(download_count=increment_by('download_count', per_mod))
+        record_events('downloads', per_mod)
+        return updated
+
+
+view_counter = ViewCountBuffer()
+download_counter = DownloadCountBuffer()
+
+
+def overlay_live_counts(data, state):
+    """
+    Replace the counters of a (possibly cached) mod detail payload with the
+    stored values of `state` (a fresh row with id, view_count and
+    download_count) plus what is still buffered here
+    """
+    data['view_count'] = state['view_count'] + view_counter.pending(state['id'])
+    data['download_count'] = state['download_count'] + download_counter.pending(state['id'])
+    return data
+
+
+atexit.register(view_counter.flush_in_background)
+atexit.register(download_counter.flush_in_background)
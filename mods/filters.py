@@ -1,26 +1,58 @@
 import django_filters
 from django.db.models import Q
-from .models import Mod
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from .models import Mod, Comment, GameVersion
+from .search import search_mods
+from .services import parse_stored_version, parse_version
 
 class ModFilter(django_filters.FilterSet):
-    min_rating = django_filters.NumberFilter(field_name='average_rating', lookup_expr='gte')
+    # Every filter maps onto an indexed column (see Mod.Meta.indexes)
     category = django_filters.CharFilter(field_name='category__slug')
-    game_version = django_filters.CharFilter(field_name='game_versions__version')
-    author = django_filters.CharFilter(field_name='author__username')
-    
+    uploader = django_filters.CharFilter(field_name='uploader_name')
+    author = django_filters.CharFilter(field_name='uploader_name')  # Older clients
+    version = django_filters.CharFilter(field_name='version')
+    # Mods that run on this version, not ones declaring it as their minimum
+    game_version = django_filters.CharFilter(method='filter_game_version')
+    min_rating = django_filters.NumberFilter(field_name='average_rating', lookup_expr='gte')
+    max_rating = django_filters.NumberFilter(field_name='average_rating', lookup_expr='lte')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
     # Custom search
     q = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Mod
-        fields = ['category', 'game_version', 'status', 'author']
+        fields = ['category', 'uploader', 'version', 'game_version', 'status']
+
+    def filter_game_version(self, queryset, name, value):
+        try:
+            requested = parse_version(value)
+        except ValueError as exc:
+            raise ValidationError({name: [str(exc)]})
+        # A handful of rows, compared with the numeric version ordering
+        compatible = [
+            pk for pk, version in GameVersion.objects.values_list('pk', 'version')
+            if parse_stored_version(version) <= requested
+        ]
+        return queryset.filter(Q(min_game_version__isnull=True) | Q(min_game_version__in=compatible))
 
     def filter_search(self, queryset, name, value):
-        if not value:
-            return queryset
-        # Standard Django search (Works on SQLite & Postgres)
-        return queryset.filter(
-            Q(title__icontains=value) | 
-            Q(description__icontains=value) |
-            Q(author__username__icontains=value)
-        )
\ No newline at end of file
+        # Ranked full-text search (Postgres tsvector, in-memory index elsewhere)
+        return search_mods(queryset, value)
+
+
+class ModSearchFilter(filters.SearchFilter):
+    """`?search=` backed by the full-text index instead of icontains scans"""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_mods(queryset, request.query_params.get(self.search_param, ''))
+
+
+class CommentFilter(django_filters.FilterSet):
+    mod = django_filters.CharFilter(field_name='mod__slug')
+
+    class Meta:
+        model = Comment
+        fields = ['mod']
@@ -0,0 +1,102 @@
+"""
+Image pipeline: uploads are stored as-is on the request path, resized WebP
+variants are rendered afterwards by a worker.
+
+IMAGE_PIPELINE_RUNNER selects the worker: 'thread' (local thread pool),
+'sync' (inline, for tests/scripts) or the dotted path of a callable taking
+an image id, e.g. a task queue's enqueue function in production.
+"""
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models.functions import Now
+from django.utils.module_loading import import_string
+from PIL import Image
+from core.cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+# ModImage field -> bounding box of the rendered WebP
+VARIANTS = {
+    'thumbnail': (480, 270),
+    'medium': (1280, 720),
+}
+WEBP_QUALITY = 80
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def render_variant(original, size):
+    variant = original.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    if variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGBA' if 'A' in variant.getbands() else 'RGB')
+    buffer = io.BytesIO()
+    variant.save(buffer, 'WEBP', quality=WEBP_QUALITY)
+    return ContentFile(buffer.getvalue())
+
+
+def mark(image, **fields):
+    """
+    Update the image row and bump its mod's updated_at: variants and status
+    are part of the detail response, whose ETag / Last-Modified come from it
+    """
+    from .models import Mod, ModImage
+
+    with transaction.atomic():
+        ModImage.objects.filter(pk=image.pk).update(**fields)
+        Mod.objects.filter(pk=image.mod_id).update(updated_at=Now())
+
+
+def generate_variants(image_id):
+    """Render and store every variant of one ModImage"""
+    from .models import ModImage
+
+    image = ModImage.objects.filter(pk=image_id).first()
+    if image is None or not image.image:
+        return
+    try:
+        with image.image.open('rb') as source:
+            original = Image.open(source)
+            original.load()
+        names = {}
+        for field, size in VARIANTS.items():
+            storage = ModImage._meta.get_field(field).storage
+            names[field] = storage.save(f'mod_images/variants/{image_id}-{field}.webp', render_variant(original, size))
+        mark(image, processing_status='ready', **names)
+    except Exception:
+        logger.exception('Failed to render variants for mod image %s', image_id)
+        mark(image, processing_status='failed')
+    invalidate_catalog()
+
+
+def _run_in_worker(image_id):
+    try:
+        generate_variants(image_id)
+    finally:
+        close_old_connections()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_PIPELINE_WORKERS, thread_name_prefix='image-pipeline'
+            )
+        return _executor
+
+
+def enqueue_variants(image_id):
+    runner = settings.IMAGE_PIPELINE_RUNNER
+    if runner == 'sync':
+        generate_variants(image_id)
+    elif runner == 'thread':
+        _get_executor().submit(_run_in_worker, image_id)
+    else:
+        import_string(runner)(image_id)
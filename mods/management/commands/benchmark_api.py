@@ -0,0 +1,137 @@
+import json
+import random
+import subprocess
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from mods.benchmark import TITLE_WORDS, run_load, seed_catalog, throwaway_database
+from mods.counters import download_counter, view_counter
+from mods.models import Mod
+
+ENDPOINTS = ['list', 'detail', 'search', 'comment']
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and load test the public API (list, detail, search, '
+        'comment post) at a fixed concurrency, reporting throughput, p50/p95/p99 latency and queries'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=2000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--images', type=int, default=3, help='Images per mod')
+        parser.add_argument('--links', type=int, default=2, help='Download links per mod')
+        parser.add_argument('--comments', type=int, default=5, help='Comments per mod')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+        parser.add_argument('--with-cache', action='store_true', help='Keep the catalog response cache enabled')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+        parser.add_argument('--compare', help='JSON report of an earlier run to diff against')
+
+    def handle(self, *args, **options):
+        endpoints = options['endpoints'].split(',')
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        baseline = self.load_report(options['compare']) if options['compare'] else None
+
+        # Counters are flushed by hand below, never by a thread outliving the test database
+        overrides = {'VIEW_COUNT_FLUSH_INTERVAL': 0, 'DOWNLOAD_COUNT_FLUSH_INTERVAL': 0}
+        if not options['with_cache']:
+            # Measure the application and database, not the response cache
+            overrides['CATALOG_CACHE_TIMEOUT'] = 0
+        # In-memory databases aren't shared between the worker threads
+        with throwaway_database('benchmark_api.sqlite3', **overrides):
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            seed_catalog(
+                mods=options['mods'], categories=options['categories'], seed=options['seed'],
+                images=options['images'], links=options['links'], comments=options['comments'],
+            )
+            published = list(Mod.objects.filter(status='published').values_list('id', 'slug'))
+            if not published:
+                raise CommandError('The seeded catalog has no published mods')
+            scenarios = self.build_scenarios(published, options['seed'])
+
+            results = {}
+            for name in endpoints:
+                self.stderr.write(f'Running {name}...')
+                results[name] = run_load(scenarios[name], options['requests'], options['concurrency'])
+            view_counter.flush()
+            download_counter.flush()
+
+        report = {
+            'meta': {
+                'commit': self.current_commit(),
+                'timestamp': timezone.now().isoformat(),
+                'database': connection.vendor,
+                **{key: options[key] for key in (
+                    'mods', 'categories', 'images', 'links', 'comments', 'requests', 'concurrency', 'with_cache'
+                )},
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results, baseline)
+
+    def build_scenarios(self, published, seed):
+        rng = random.Random(seed)
+        mods = [rng.choice(published) for _ in range(1000)]
+        words = [word.lower() for word in TITLE_WORDS]
+
+        def pick(items, i):
+            return items[i % len(items)]
+
+        def comment(client, i):
+            mod_id, _ = pick(mods, i)
+            # Every request from its own address: a crowd, not one throttled client
+            return client.post(
+                '/api/mods/comments/',
+                {'mod_id': str(mod_id), 'content': 'Benchmark comment', 'rating': i % 6},
+                REMOTE_ADDR=f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}',
+            )
+
+        return {
+            'list': lambda client, i: client.get('/api/mods/items/', {'page': i % 5 + 1}),
+            'detail': lambda client, i: client.get(f'/api/mods/items/{pick(mods, i)[1]}/'),
+            'search': lambda client, i: client.get('/api/mods/items/', {'search': pick(words, i)}),
+            'comment': comment,
+        }
+
+    def current_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def load_report(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline report {path}: {exc}')
+
+    def print_table(self, results, baseline):
+        previous = baseline['results'] if baseline else {}
+        self.stdout.write(
+            f"{'endpoint':<10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'errors':>8}{'p95 vs base':>13}"
+        )
+        for name, stats in results.items():
+            delta = ''
+            if name in previous and previous[name]['p95']:
+                delta = f"{(stats['p95'] / previous[name]['p95'] - 1) * 100:+.0f}%"
+            self.stdout.write(
+                f"{name:<10}{stats['throughput']:>9.1f}{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['p99']:>9.1f}"
+                f"{stats['queries_mean']:>9.1f}{stats['errors']:>8}{delta:>13}"
+            )
@@ -0,0 +1,151 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from mods.benchmark import run_async_load, seed_catalog, throwaway_database
+from mods.counters import view_counter
+from mods.models import Mod
+
+ENDPOINTS = ['list', 'detail', 'categories']
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare the public read endpoints served sync '
+        '(a fixed pool of worker threads, like gunicorn --threads) and async (the ASGI views of '
+        'config/urls_async.py) at high concurrency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=2000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=100, help='Requests in flight')
+        parser.add_argument('--sync-workers', type=int, default=8, help='Threads serving the sync mode')
+        parser.add_argument(
+            '--query-latency', type=float, default=0.0,
+            help='Milliseconds added to every query, to simulate a database across the network',
+        )
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        endpoints = options['endpoints'].split(',')
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        if options['query_latency']:
+            delay = options['query_latency'] / 1000
+            connection_created.connect(
+                lambda connection, **kwargs: connection.execute_wrappers.append(self.slow_query(delay)),
+                weak=False,
+            )
+
+        # Measure the views and the database, not the response cache; the view
+        # counter is flushed by hand below. In-memory databases aren't shared
+        # between threads.
+        with throwaway_database('benchmark_asgi.sqlite3', VIEW_COUNT_FLUSH_INTERVAL=0, CATALOG_CACHE_TIMEOUT=0):
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            seed_catalog(mods=options['mods'], categories=options['categories'], seed=options['seed'])
+            rng = random.Random(options['seed'])
+            slugs = list(Mod.objects.filter(status='published').values_list('slug', flat=True))
+            if not slugs:
+                raise CommandError('The seeded catalog has no published mods')
+            slugs = [rng.choice(slugs) for _ in range(1000)]
+            paths = {
+                'list': lambda i: ('/api/mods/items/', {'page': i % 5 + 1}),
+                'detail': lambda i: (f'/api/mods/items/{slugs[i % len(slugs)]}/', None),
+                'categories': lambda i: ('/api/categories/', None),
+            }
+
+            results = {}
+            for name in endpoints:
+                self.stderr.write(f'Running {name}...')
+                results[name] = {
+                    'sync': self.run_sync(paths[name], options),
+                    'async': self.run_async(paths[name], options),
+                }
+            view_counter.flush()
+
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'database': connection.vendor,
+                **{key: options[key] for key in (
+                    'mods', 'categories', 'requests', 'concurrency', 'sync_workers', 'query_latency'
+                )},
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results)
+
+    def slow_query(self, delay):
+        def wrapper(execute, sql, params, many, context):
+            time.sleep(delay)
+            return execute(sql, params, many, context)
+        return wrapper
+
+    def run_sync(self, path, options):
+        """`concurrency` clients queueing for `sync_workers` threads running the DRF views"""
+        workers = options['sync_workers']
+        local = threading.local()
+
+        def get(i):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            return local.client.get(*path(i))
+
+        def close(barrier):
+            # The barrier hands exactly one of these to every worker thread
+            barrier.wait()
+            connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            async def request(client, i):
+                return await sync_to_async(get, thread_sensitive=False, executor=pool)(i)
+
+            with override_settings(ROOT_URLCONF='config.urls'):
+                stats = run_async_load(request, options['requests'], options['concurrency'])
+            barrier = threading.Barrier(workers)
+            list(pool.map(close, [barrier] * workers))
+        return stats
+
+    def run_async(self, path, options):
+        """`concurrency` clients on the async views, as the ASGI server runs them"""
+        async def request(client, i):
+            url, params = path(i)
+            return await client.get(url, params)
+
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('whitenoise.')]
+        with override_settings(ROOT_URLCONF='config.urls_async', MIDDLEWARE=middleware):
+            stats = run_async_load(request, options['requests'], options['concurrency'])
+        return stats
+
+    def print_table(self, results):
+        self.stdout.write(
+            f"{'endpoint':<12}{'mode':<7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        )
+        for name, modes in results.items():
+            for mode, stats in modes.items():
+                self.stdout.write(
+                    f"{name:<12}{mode:<7}{stats['throughput']:>9.1f}{stats['p50']:>9.1f}"
+                    f"{stats['p95']:>9.1f}{stats['p99']:>9.1f}{stats['errors']:>8}"
+                )
@@ -0,0 +1,73 @@
+import json
+from datetime import timedelta
+from itertools import combinations
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mods.benchmark import seed_catalog, summarize, throwaway_database, time_calls
+from mods.models import Mod
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with a large catalog and report latency and query '
+        'count of every ModFilter combination on the public list endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=100000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        # Measure the database, not the catalog response cache
+        with throwaway_database(CATALOG_CACHE_TIMEOUT=0):
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            seed_catalog(mods=options['mods'], categories=options['categories'])
+            results = self.run(self.filter_values(), options['runs'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'filters':<60}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'rows':>8}")
+        for name, stats in sorted(results.items(), key=lambda item: -item[1]['p95']):
+            self.stdout.write(
+                f"{name:<60}{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['queries']:>9}{stats['count']:>8}"
+            )
+
+    def filter_values(self):
+        """One realistic value set per ModFilter filter, taken from the seeded data"""
+        sample = Mod.objects.filter(status='published').select_related('category', 'min_game_version').first()
+        created = sample.created_at
+        return {
+            'category': {'category': sample.category.slug},
+            'uploader': {'uploader': sample.uploader_name},
+            'version': {'version': sample.version},
+            'game_version': {'game_version': sample.min_game_version.version},
+            'rating': {'min_rating': 3, 'max_rating': 4.5},
+            'created': {
+                'created_after': (created - timedelta(days=30)).isoformat(),
+                'created_before': created.isoformat(),
+            },
+            'q': {'q': sample.title.split()[0]},
+        }
+
+    def run(self, filters, runs):
+        client = Client()
+        results = {}
+        names = sorted(filters)
+        for size in range(len(names) + 1):
+            for combo in combinations(names, size):
+                params = {}
+                for name in combo:
+                    params.update(filters[name])
+                client.get('/api/mods/items/', params)  # warm up
+                reset_queries()  # The capped query log would hide new entries
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get('/api/mods/items/', params)
+                stats = summarize(time_calls(lambda: client.get('/api/mods/items/', params), runs))
+                stats.update(queries=len(ctx.captured_queries), count=response.json()['count'])
+                results['+'.join(combo) or '(none)'] = stats
+        return results
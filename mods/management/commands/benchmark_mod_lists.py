@@ -0,0 +1,74 @@
+import json
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from mods.benchmark import analyze, seed_catalog, summarize, throwaway_database, time_calls
+from mods.models import Mod
+
+ORDERINGS = ['-created_at', 'created_at', '-view_count', '-average_rating', '-trending_score', '-top_rated_score']
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database with a large catalog and report p50/p95 latency '
+        'of every list filter/ordering combination, with and without the Mod indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=100000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--runs', type=int, default=50)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        # Measure the database, not the catalog response cache
+        with throwaway_database(CATALOG_CACHE_TIMEOUT=0):
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            categories = seed_catalog(mods=options['mods'], categories=options['categories'])
+            scenarios = self.build_scenarios(categories[0].slug)
+
+            results = {'with_indexes': self.run(scenarios, options['runs'])}
+            with self.indexes_dropped():
+                results['without_indexes'] = self.run(scenarios, options['runs'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'scenario':<45}{'indexed p50/p95 ms':>22}{'unindexed p50/p95 ms':>24}")
+        for name, stats in results['with_indexes'].items():
+            before = results['without_indexes'][name]
+            self.stdout.write(
+                f"{name:<45}{stats['p50']:>11.1f}/{stats['p95']:<10.1f}{before['p50']:>13.1f}/{before['p95']:<10.1f}"
+            )
+
+    def build_scenarios(self, category_slug):
+        scenarios = {}
+        for ordering in ORDERINGS:
+            scenarios[f'ordering={ordering}'] = {'ordering': ordering}
+            scenarios[f'category&ordering={ordering}'] = {'category': category_slug, 'ordering': ordering}
+        return scenarios
+
+    def run(self, scenarios, runs):
+        client = Client()
+        results = {}
+        for name, params in scenarios.items():
+            client.get('/api/mods/items/', params)  # warm up
+            results[name] = summarize(time_calls(lambda: client.get('/api/mods/items/', params), runs))
+        return results
+
+    @contextmanager
+    def indexes_dropped(self):
+        # The GIN index is Postgres-only and irrelevant to list queries
+        indexes = [index for index in Mod._meta.indexes if index.name != 'mod_search_vector_gin']
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(Mod, index)
+        analyze()
+        try:
+            yield
+        finally:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(Mod, index)
+            analyze()
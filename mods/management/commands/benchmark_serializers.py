@@ -0,0 +1,86 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Prefetch
+from django.test import RequestFactory
+from mods.benchmark import seed_catalog, summarize, throwaway_database, time_calls
+from mods.models import Comment, Mod
+from mods.serializers import (
+    LATEST_COMMENTS, ModDetailRowSerializer, ModDetailSerializer, ModListRowSerializer, ModListSerializer
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and compare the per-object cost of the DRF mod serializers '
+        'with the .values() row serializers used by the list and detail endpoints'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=500)
+        parser.add_argument('--page-size', type=int, default=100, help='Mods per serialized list page')
+        parser.add_argument('--details', type=int, default=50, help='Mods per detail run')
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            seed_catalog(mods=options['mods'], images=3, links=2, comments=12)
+            results = self.run(options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'scenario':<34}{'drf us/obj':>12}{'rows us/obj':>13}{'speedup':>9}")
+        for name, modes in results.items():
+            drf, rows = modes['drf']['p50'], modes['rows']['p50']
+            self.stdout.write(f"{name:<34}{drf:>12.1f}{rows:>13.1f}{drf / rows if rows else 0:>8.1f}x")
+
+    def run(self, options):
+        runs, size = options['runs'], options['page_size']
+        context = {'request': RequestFactory().get('/api/mods/items/')}
+        mods = Mod.objects.filter(status='published')
+        instances = list(mods.select_related('category', 'cover_image')[:size])
+        rows = list(mods.values(*ModListRowSerializer.columns)[:size])
+        slugs = list(mods.values_list('slug', flat=True)[:options['details']])
+
+        # The detail querysets of ModViewSet before and after the row serializers
+        detail_instances = mods.select_related('category').prefetch_related(
+            'download_links', 'images', 'required_dlcs', 'conflicts_with',
+            Prefetch(
+                'comments', queryset=Comment.objects.order_by('-created_at', '-pk')[:LATEST_COMMENTS],
+                to_attr='latest_comments',
+            ),
+        ).annotate(comment_count=Count('comments'))
+        detail_rows = mods.annotate(comment_count=Count('comments')).values(*ModDetailRowSerializer.columns)
+
+        scenarios = {
+            'list page (serialize)': (
+                lambda: ModListSerializer(instances, many=True, context=context).data,
+                lambda: ModListRowSerializer(rows, many=True, context=context).data,
+                len(instances),
+            ),
+            'list page (query + serialize)': (
+                lambda: ModListSerializer(
+                    mods.select_related('category', 'cover_image')[:size], many=True, context=context
+                ).data,
+                lambda: ModListRowSerializer(
+                    mods.values(*ModListRowSerializer.columns)[:size], many=True, context=context
+                ).data,
+                len(instances),
+            ),
+            'detail (query + serialize)': (
+                lambda: [ModDetailSerializer(detail_instances.get(slug=slug), context=context).data for slug in slugs],
+                lambda: [ModDetailRowSerializer(detail_rows.get(slug=slug), context=context).data for slug in slugs],
+                len(slugs),
+            ),
+        }
+        results = {}
+        for name, (drf, lean, count) in scenarios.items():
+            results[name] = {}
+            for mode, fn in (('drf', drf), ('rows', lean)):
+                fn()  # warm up
+                # Microseconds per object
+                samples = [elapsed * 1000 / max(count, 1) for elapsed in time_calls(fn, runs)]
+                results[name][mode] = summarize(samples)
+        return results
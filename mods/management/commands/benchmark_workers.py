@@ -0,0 +1,186 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from config.gunicorn import cpu_count
+from mods.benchmark import seed_catalog, summarize, throwaway_database
+from mods.models import Mod
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database, start gunicorn (config/gunicorn.py) with 1, 2, 4... '
+        'workers and load test the mod list and detail endpoints over HTTP, reporting how '
+        'throughput scales with the worker count'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mods', type=int, default=2000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument(
+            '--workers', help='Comma separated worker counts (default: powers of two up to 2 x CPUs)'
+        )
+        parser.add_argument('--threads', type=int, default=4, help='GUNICORN_THREADS of each worker')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per worker count')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--with-cache', action='store_true', help='Keep the catalog response cache enabled')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['workers']:
+            counts = [int(count) for count in options['workers'].split(',')]
+        else:
+            counts = [1]
+            while counts[-1] * 2 <= cpu_count() * 2:
+                counts.append(counts[-1] * 2)
+
+        # The server processes need a database file, not an in-memory one
+        with throwaway_database('benchmark_workers.sqlite3'):
+            self.stderr.write(f"Seeding {options['mods']} mods...")
+            seed_catalog(mods=options['mods'], categories=options['categories'], seed=options['seed'])
+            rng = random.Random(options['seed'])
+            slugs = list(Mod.objects.filter(status='published').values_list('slug', flat=True))
+            if not slugs:
+                raise CommandError('The seeded catalog has no published mods')
+            paths = [
+                f'/api/mods/items/?{urlencode({"page": i % 5 + 1})}' if i % 2 else
+                f'/api/mods/items/{rng.choice(slugs)}/'
+                for i in range(1000)
+            ]
+            connection.close()
+
+            results = {}
+            for count in counts:
+                self.stderr.write(f'Running {count} worker(s)...')
+                with self.server(count, options):
+                    results[count] = self.run_load(paths, options)
+
+        base = results[counts[0]]['throughput']
+        for stats in results.values():
+            stats['speedup'] = stats['throughput'] / base if base else 0.0
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'cpus': cpu_count(),
+                **{key: options[key] for key in (
+                    'mods', 'categories', 'threads', 'requests', 'concurrency', 'with_cache'
+                )},
+            },
+            'results': {str(count): stats for count, stats in results.items()},
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results)
+
+    def database_url(self):
+        db = connection.settings_dict
+        if connection.vendor == 'sqlite':
+            return f"sqlite:///{db['NAME']}"
+        credentials = quote(db['USER'] or '')
+        if db['PASSWORD']:
+            credentials += f":{quote(db['PASSWORD'])}"
+        return f"postgres://{credentials}@{db['HOST'] or 'localhost'}:{db['PORT'] or 5432}/{db['NAME']}"
+
+    def server(self, workers, options):
+        env = {
+            **os.environ,
+            'DATABASE_URL': self.database_url(),
+            'PORT': str(options['port']),
+            'WEB_CONCURRENCY': str(workers),
+            'GUNICORN_THREADS': str(options['threads']),
+            # No flusher threads writing view counts during the run
+            'VIEW_COUNT_FLUSH_INTERVAL': '0',
+            'DOWNLOAD_COUNT_FLUSH_INTERVAL': '0',
+        }
+        if not options['with_cache']:
+            env['CATALOG_CACHE_TIMEOUT'] = '0'
+        return Server(
+            [sys.executable, '-m', 'gunicorn', '-c', 'config/gunicorn.py', 'config.wsgi:application'],
+            env, f"http://127.0.0.1:{options['port']}",
+        )
+
+    def run_load(self, paths, options):
+        base_url = f"http://127.0.0.1:{options['port']}"
+
+        def get(i):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + paths[i % len(paths)], timeout=30) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except OSError:
+                status = 599
+            return (time.perf_counter() - start) * 1000, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(get, range(options['requests'])))
+        wall = time.perf_counter() - start
+        return {
+            'requests': len(results),
+            'errors': sum(1 for _, status in results if status >= 400),
+            'throughput': len(results) / wall if wall else 0.0,
+            **summarize([elapsed for elapsed, _ in results]),
+        }
+
+    def print_table(self, results):
+        self.stdout.write(
+            f"{'workers':>8}{'req/s':>9}{'speedup':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        )
+        for count, stats in results.items():
+            self.stdout.write(
+                f"{count:>8}{stats['throughput']:>9.1f}{stats['speedup']:>8.2f}x{stats['p50']:>9.1f}"
+                f"{stats['p95']:>9.1f}{stats['p99']:>9.1f}{stats['errors']:>8}"
+            )
+
+
+class Server:
+    """A gunicorn process for the duration of a with block, ready to serve on entry"""
+
+    def __init__(self, command, env, url, boot_timeout=60):
+        self.command, self.env, self.url, self.boot_timeout = command, env, url, boot_timeout
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            self.command, env=self.env, cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.boot_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError(f'gunicorn exited with status {self.process.returncode}')
+            try:
+                with urllib.request.urlopen(self.url + '/readyz', timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise CommandError(f'gunicorn did not answer within {self.boot_timeout}s')
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
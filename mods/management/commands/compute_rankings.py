@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from mods.ranking import compute_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute the trending and top rated scores of every mod (run periodically, e.g. hourly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = compute_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed rankings, {changed} mod(s) changed.'))
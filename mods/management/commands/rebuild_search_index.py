@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from mods import search
+from mods.models import Mod
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search data of every mod'
+
+    def handle(self, *args, **options):
+        if search.uses_postgres():
+            updated = Mod.objects.update(search_vector=search.build_search_vector())
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {updated} mod(s).'))
+        else:
+            # The in-memory index is per process; drop it so it rebuilds on next search
+            search.inverted_index.reset()
+            self.stdout.write(self.style.SUCCESS('Reset the in-memory search index.'))
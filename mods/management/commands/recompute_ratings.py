@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from mods.models import Mod, Comment
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cached rating aggregates (sum, count, average) of every mod from its comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        totals = {
+            row['mod']: (row['total'], row['count'])
+            for row in Comment.objects.filter(rating__gt=0)
+            .values('mod')
+            .annotate(total=Sum('rating'), count=Count('id'))
+            .order_by()
+        }
+
+        changed = []
+        with transaction.atomic():
+            mods = Mod.objects.select_for_update().only('id', 'rating_sum', 'rating_count', 'average_rating')
+            for mod in mods.iterator(chunk_size=batch_size):
+                total, count = totals.get(mod.id, (0, 0))
+                average = round(total / count, 1) if count else 0.0
+                if (mod.rating_sum, mod.rating_count, mod.average_rating) != (total, count, average):
+                    mod.rating_sum, mod.rating_count, mod.average_rating = total, count, average
+                    changed.append(mod)
+            Mod.objects.bulk_update(
+                changed, ['rating_sum', 'rating_count', 'average_rating'], batch_size=batch_size
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Recomputed ratings, {len(changed)} mod(s) corrected.'))
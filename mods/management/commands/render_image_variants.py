@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from mods.images import generate_variants
+from mods.models import ModImage
+
+
+class Command(BaseCommand):
+    help = 'Render thumbnail/medium WebP variants for mod images that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--failed', action='store_true', help='Also retry images whose rendering failed')
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['failed'] else ['pending']
+        image_ids = list(ModImage.objects.filter(processing_status__in=statuses).values_list('pk', flat=True))
+        for image_id in image_ids:
+            generate_variants(image_id)
+        self.stdout.write(self.style.SUCCESS(f'Processed {len(image_ids)} image(s).'))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:39
+
+from django.db import migrations, models
+
+
+def backfill_rating_sum(apps, schema_editor):
+    Mod = apps.get_model('mods', 'Mod')
+    Comment = apps.get_model('mods', 'Comment')
+    totals = (
+        Comment.objects.filter(rating__gt=0)
+        .values('mod')
+        .annotate(total=models.Sum('rating'))
+        .order_by()
+    )
+    for row in totals:
+        Mod.objects.filter(pk=row['mod']).update(rating_sum=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0003_comment_rating_mod_average_rating_mod_rating_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mod',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class PostgresOnlyAddIndex(migrations.AddIndex):
+    """GIN indexes only exist on Postgres; other backends just track the state"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from mods.search import build_search_vector
+    Mod = apps.get_model('mods', 'Mod')
+    Mod.objects.update(search_vector=build_search_vector())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0004_mod_rating_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mod',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgresOnlyAddIndex(
+            model_name='mod',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='mod_search_vector_gin'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0005_mod_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(fields=['status', '-created_at'], name='mod_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(fields=['status', 'category', '-created_at'], name='mod_status_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-view_count'], name='mod_published_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-average_rating'], name='mod_published_rating_idx'),
+        ),
+    ]
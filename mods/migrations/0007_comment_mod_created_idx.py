@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0006_mod_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['mod', '-created_at'], name='comment_mod_created_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0007_comment_mod_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DLC',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+            ],
+            options={
+                'verbose_name': 'DLC',
+                'verbose_name_plural': 'DLCs',
+            },
+        ),
+        migrations.CreateModel(
+            name='GameVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text='e.g. 1.49', max_length=20, unique=True)),
+                ('released_at', models.DateField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='conflicts_with',
+            field=models.ManyToManyField(blank=True, to='mods.mod'),
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='min_game_version',
+            field=models.ForeignKey(blank=True, help_text='Oldest game version the mod runs on', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mods.gameversion'),
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='required_dlcs',
+            field=models.ManyToManyField(blank=True, related_name='required_by', to='mods.dlc'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0008_compatibility'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(fields=['status', 'uploader_name', '-created_at'], name='mod_status_uploader_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(fields=['status', 'version'], name='mod_status_version_idx'),
+        ),
+    ]
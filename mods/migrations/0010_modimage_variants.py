@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0009_mod_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modimage',
+            name='medium',
+            field=models.ImageField(blank=True, editable=False, upload_to='mod_images/variants/'),
+        ),
+        migrations.AddField(
+            model_name='modimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='modimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='mod_images/variants/'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def drop_duplicate_covers(apps, schema_editor):
+    # Keep the newest cover of each mod before the unique constraint lands
+    ModImage = apps.get_model('mods', 'ModImage')
+    newest = (
+        ModImage.objects.filter(is_cover=True)
+        .values('mod')
+        .annotate(keep=models.Max('pk'))
+        .order_by()
+    )
+    keep = [row['keep'] for row in newest]
+    ModImage.objects.filter(is_cover=True).exclude(pk__in=keep).update(is_cover=False)
+
+
+def backfill_cover_image(apps, schema_editor):
+    Mod = apps.get_model('mods', 'Mod')
+    ModImage = apps.get_model('mods', 'ModImage')
+    cover = ModImage.objects.filter(mod=models.OuterRef('pk')).order_by('-is_cover', 'pk')
+    Mod.objects.update(cover_image=models.Subquery(cover.values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0010_modimage_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_covers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='modimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_cover', True)), fields=('mod',), name='modimage_one_cover_per_mod'),
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='cover_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mods.modimage'),
+        ),
+        migrations.RunPython(backfill_cover_image, migrations.RunPython.noop),
+    ]
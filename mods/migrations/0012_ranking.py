@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0011_mod_cover_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the hour')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('downloads', models.PositiveIntegerField(default=0)),
+                ('comments', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'mod activity',
+            },
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='top_rated_score',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='mod',
+            name='trending_score',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-trending_score'], name='mod_published_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mod',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-top_rated_score'], name='mod_published_top_rated_idx'),
+        ),
+        migrations.AddField(
+            model_name='modactivity',
+            name='mod',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='mods.mod'),
+        ),
+        migrations.AddIndex(
+            model_name='modactivity',
+            index=models.Index(fields=['bucket'], name='modactivity_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='modactivity',
+            constraint=models.UniqueConstraint(fields=('mod', 'bucket'), name='modactivity_mod_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:49
+
+from django.db import migrations, models
+import mods.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mods', '0013_download_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gameversion',
+            name='version',
+            field=models.CharField(help_text='e.g. 1.49', max_length=20, unique=True, validators=[mods.models.validate_game_version]),
+        ),
+    ]
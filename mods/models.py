@@ -1,8 +1,48 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models.functions import Cast, Now, Round
 from django.utils.text import slugify
 from categories.models import Category
+from core.cache import invalidate_catalog
+from core.slugs import save_with_unique_slug
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
+from functools import partial
+from . import ranking, search
+from .images import enqueue_variants
+
+def validate_game_version(value):
+    # Compatibility checks compare versions with parse_version
+    from .services import parse_version
+    try:
+        parse_version(value)
+    except ValueError as exc:
+        raise ValidationError(str(exc))
+
+
+class GameVersion(models.Model):
+    version = models.CharField(
+        max_length=20, unique=True, validators=[validate_game_version], help_text="e.g. 1.49"
+    )
+    released_at = models.DateField(blank=True, null=True)
+
+    def __str__(self):
+        return self.version
+
+
+class DLC(models.Model):
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True)
+
+    class Meta:
+        verbose_name = 'DLC'
+        verbose_name_plural = 'DLCs'
+
+    def __str__(self):
+        return self.name
+
 
 class Mod(models.Model):
     STATUS_CHOICES = (
@@ -26,6 +66,14 @@ class Mod(models.Model):
     
     # Meta
     version = models.CharField(max_length=50, blank=True, help_text="e.g. 1.0")
+
+    # Compatibility
+    min_game_version = models.ForeignKey(
+        GameVersion, on_delete=models.SET_NULL, blank=True, null=True, related_name='+',
+        help_text="Oldest game version the mod runs on"
+    )
+    required_dlcs = models.ManyToManyField(DLC, blank=True, related_name='required_by')
+    conflicts_with = models.ManyToManyField('self', blank=True)
     
     # Status
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
@@ -34,38 +82,101 @@ class Mod(models.Model):
 
     # Counters
     view_count = models.PositiveIntegerField(default=0)
+    download_count = models.PositiveIntegerField(default=0, editable=False)
     
-    # Rating Cache (Calculated on Comment save)
+    # Rating Cache (Maintained incrementally on Comment save/delete)
     average_rating = models.FloatField(default=0.0)
     rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    # Precomputed ranking scores (see mods/ranking.py)
+    trending_score = models.FloatField(default=0.0, editable=False)
+    top_rated_score = models.FloatField(default=0.0, editable=False)
+
+    # Full-text search (Postgres only, refreshed on save)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Effective cover (explicit cover, otherwise the oldest image), kept in
+    # sync by ModImage save/delete so lists can join it
+    cover_image = models.ForeignKey(
+        'ModImage', on_delete=models.SET_NULL, blank=True, null=True, editable=False, related_name='+'
+    )
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='mod_search_vector_gin'),
+            # Public lists: status filter + default / category ordering
+            models.Index(fields=['status', '-created_at'], name='mod_status_created_idx'),
+            models.Index(fields=['status', 'category', '-created_at'], name='mod_status_cat_created_idx'),
+            # ModFilter equality filters
+            models.Index(fields=['status', 'uploader_name', '-created_at'], name='mod_status_uploader_idx'),
+            models.Index(fields=['status', 'version'], name='mod_status_version_idx'),
+            # Published-only orderings exposed through ModViewSet.ordering_fields
+            models.Index(
+                fields=['-view_count'], condition=models.Q(status='published'), name='mod_published_views_idx'
+            ),
+            models.Index(
+                fields=['-average_rating'], condition=models.Q(status='published'), name='mod_published_rating_idx'
+            ),
+            models.Index(
+                fields=['-trending_score'], condition=models.Q(status='published'), name='mod_published_trending_idx'
+            ),
+            models.Index(
+                fields=['-top_rated_score'], condition=models.Q(status='published'), name='mod_published_top_rated_idx'
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
             base_slug = slugify(self.title)
             if not base_slug:
                 base_slug = f"mod-{str(self.id)[:8]}"
-            slug = base_slug
-            counter = 1
-            while Mod.objects.filter(slug=slug).exclude(id=self.id).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, base_slug, lambda: super(Mod, self).save(*args, **kwargs))
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(search.SEARCH_FIELDS):
+            search.index_mods([self])
+        invalidate_catalog()
 
     def calculate_rating(self):
-        reviews = self.comments.filter(rating__gt=0)
-        count = reviews.count()
-        if count > 0:
-            avg = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.average_rating = round(avg, 1)
-            self.rating_count = count
-        else:
-            self.average_rating = 0.0
-            self.rating_count = 0
-        self.save(update_fields=['average_rating', 'rating_count'])
+        """Full recompute from comments (repair only, see recompute_ratings)"""
+        totals = self.comments.filter(rating__gt=0).aggregate(
+            total=models.Sum('rating'), count=models.Count('id')
+        )
+        self.rating_sum = totals['total'] or 0
+        self.rating_count = totals['count']
+        self.average_rating = round(self.rating_sum / self.rating_count, 1) if self.rating_count else 0.0
+        self.save(update_fields=['average_rating', 'rating_count', 'rating_sum'])
+
+    @classmethod
+    def apply_rating_delta(cls, mod_id, sum_delta, count_delta):
+        """Shift the rating aggregates (and updated_at) of one mod in a single UPDATE"""
+        if not sum_delta and not count_delta:
+            return
+        new_sum = models.F('rating_sum') + sum_delta
+        new_count = models.F('rating_count') + count_delta
+        cls.objects.filter(pk=mod_id).update(
+            updated_at=Now(),
+            rating_sum=new_sum,
+            rating_count=new_count,
+            average_rating=models.Case(
+                models.When(rating_count__lte=-count_delta, then=models.Value(0.0)),
+                default=Round(Cast(new_sum, models.FloatField()) / new_count, 1),
+                output_field=models.FloatField(),
+            ),
+        )
+
+    @classmethod
+    def refresh_cover(cls, mod_id):
+        """Re-point cover_image (and bump updated_at) in a single UPDATE"""
+        cover = ModImage.objects.filter(mod=models.OuterRef('pk')).order_by('-is_cover', 'pk')
+        cls.objects.filter(pk=mod_id).update(
+            updated_at=Now(),
+            cover_image=models.Subquery(cover.values('pk')[:1]),
+        )
 
     def __str__(self):
         return self.title
@@ -75,19 +186,66 @@ class DownloadLink(models.Model):
     name = models.CharField(max_length=100, help_text="e.g. ShareMods, Google Drive")
     url = models.URLField()
     file_size = models.CharField(max_length=50, help_text="e.g. 250 MB")
+    click_count = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return f"{self.name} - {self.mod.title}"
 
 class ModImage(models.Model):
+    PROCESSING_CHOICES = (
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+
     mod = models.ForeignKey(Mod, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='mod_images/')
     is_cover = models.BooleanField(default=False)
 
+    # Resized WebP variants (rendered off the request path, see mods/images.py)
+    thumbnail = models.ImageField(upload_to='mod_images/variants/', blank=True, editable=False)
+    medium = models.ImageField(upload_to='mod_images/variants/', blank=True, editable=False)
+    processing_status = models.CharField(max_length=10, choices=PROCESSING_CHOICES, default='pending')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['mod'], condition=models.Q(is_cover=True), name='modimage_one_cover_per_mod'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored flag so re-saving a cover doesn't touch its siblings
+        instance._stored_is_cover = instance.__dict__.get('is_cover')
+        instance._stored_mod_id = instance.__dict__.get('mod_id')
+        return instance
+
     def save(self, *args, **kwargs):
-        if self.is_cover:
-            ModImage.objects.filter(mod=self.mod, is_cover=True).update(is_cover=False)
-        super().save(*args, **kwargs)
+        # A freshly assigned file is uncommitted until the storage write below
+        new_upload = bool(self.image) and not self.image._committed
+        if new_upload:
+            self.thumbnail = self.medium = ''
+            self.processing_status = 'pending'
+        becomes_cover = self.is_cover and not (
+            getattr(self, '_stored_is_cover', False) and getattr(self, '_stored_mod_id', None) == self.mod_id
+        )
+        with transaction.atomic():
+            if becomes_cover:
+                # Lock the mod row so concurrent cover switches queue up instead
+                # of tripping the one-cover constraint
+                list(Mod.objects.select_for_update().filter(pk=self.mod_id).values_list('pk'))
+                ModImage.objects.filter(mod_id=self.mod_id, is_cover=True).exclude(pk=self.pk).update(is_cover=False)
+            super().save(*args, **kwargs)
+            # Images are part of the mod's representation (ETag / Last-Modified)
+            Mod.refresh_cover(self.mod_id)
+            stored_mod_id = getattr(self, '_stored_mod_id', None)
+            if stored_mod_id is not None and stored_mod_id != self.mod_id:
+                Mod.refresh_cover(stored_mod_id)
+        self._stored_is_cover = self.is_cover
+        self._stored_mod_id = self.mod_id
+        if new_upload:
+            transaction.on_commit(partial(enqueue_variants, self.pk))
+        invalidate_catalog()
 
 class Comment(models.Model):
     mod = models.ForeignKey(Mod, related_name='comments', on_delete=models.CASCADE)
@@ -101,4 +259,52 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Per-mod comment pages, newest first
+            models.Index(fields=['mod', '-created_at'], name='comment_mod_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored rating so edits can apply only the difference
+        instance._stored_rating = instance.__dict__.get('rating', 0)
+        return instance
+
+    def save(self, *args, **kwargs):
+        old_rating = getattr(self, '_stored_rating', 0)
+        is_new = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                ranking.record_events('comments', {self.mod_id: 1})
+            Mod.apply_rating_delta(
+                self.mod_id,
+                sum_delta=self.rating - old_rating,
+                count_delta=int(self.rating > 0) - int(old_rating > 0),
+            )
+        self._stored_rating = self.rating
+        invalidate_catalog()
+
+
+class ModActivity(models.Model):
+    """Event counts of one mod in one hour, the input of the trending score"""
+    mod = models.ForeignKey(Mod, related_name='activity', on_delete=models.CASCADE)
+    bucket = models.DateTimeField(help_text="Start of the hour")
+    views = models.PositiveIntegerField(default=0)
+    downloads = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'mod activity'
+        constraints = [
+            models.UniqueConstraint(fields=['mod', 'bucket'], name='modactivity_mod_bucket_uniq'),
+        ]
+        indexes = [
+            # Window scans and pruning in ranking.compute_scores
+            models.Index(fields=['bucket'], name='modactivity_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.mod_id} @ {self.bucket:%Y-%m-%d %H:00}"
@@ -0,0 +1,154 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on the queryset's current ordering with the pk
+    as tie-breaker, so pages stay stable on non-unique fields like view_count
+    and no COUNT(*) or OFFSET is issued.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field, self.descending = self.get_sort_key(queryset)
+        cursor = self.decode_cursor(request, queryset)
+
+        reverse = False
+        if cursor is not None:
+            value, pk, reverse = cursor
+            # Moving backwards flips the comparison and the ordering
+            newer = self.descending == reverse
+            lookup = 'gt' if newer else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'pk__{lookup}': pk})
+            )
+        descending = self.descending != reverse
+        order = ['-' + self.field, '-pk'] if descending else [self.field, 'pk']
+        if self.field == 'pk':
+            order = order[:1]
+
+        rows = list(queryset.order_by(*order)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_sort_key(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or ['pk']
+        first = ordering[0]
+        if not isinstance(first, str):
+            first = '-pk'
+        field = first.lstrip('-')
+        return ('pk' if field == 'id' else field), first.startswith('-')
+
+    def encode_cursor(self, row, reverse):
+        if isinstance(row, dict):
+            # .values() rows, selected with 'pk' and the sort field
+            value, pk = row[self.field], row['pk']
+        else:
+            value, pk = getattr(row, self.field), row.pk
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        payload = json.dumps([value, str(pk), reverse]).encode()
+        encoded = base64.urlsafe_b64encode(payload).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_model_field(self, queryset, name):
+        opts = queryset.model._meta
+        if name == 'pk':
+            return opts.pk
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return opts.get_field(name)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            # A cursor is client input: values the columns can't hold would
+            # only fail later, inside the query
+            value = self.get_model_field(queryset, self.field).to_python(value)
+            pk = queryset.model._meta.pk.to_python(pk)
+        except (TypeError, ValueError, ValidationError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None or pk is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, bool(reverse)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class SelectablePagination(BasePagination):
+    """
+    Page-number pagination by default; `?pagination=cursor` (or following a
+    `cursor` link) switches the request to keyset pagination.
+    """
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.active = self.page_number
+
+    def paginate_queryset(self, queryset, request, view=None):
+        use_cursor = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset.cursor_query_param in request.query_params
+        )
+        self.active = self.keyset if use_cursor else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.active.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.active, 'display_page_controls', False)
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number.get_schema_operation_parameters(view)
@@ -0,0 +1,113 @@
+"""
+Ranking scores behind the ``trending_score`` and ``top_rated_score`` orderings.
+
+Events are counted per mod in hourly ModActivity buckets as they happen
+(views when the view counter flushes, comments on save, downloads on click).
+compute_scores() is the periodic batch job (see the compute_rankings command)
+that turns them into indexed columns on Mod:
+
+* trending: events weighted by kind and decayed exponentially with age
+* top rated: Bayesian average, pulling mods with few ratings toward the
+  catalog-wide mean so a single 5-star vote doesn't top the list
+"""
+import math
+from collections import defaultdict
+from datetime import timedelta
+from django.db import models, transaction
+from django.utils import timezone
+from core.cache import invalidate_catalog
+from .counters import increment_by
+
+EVENT_WEIGHTS = {'views': 1.0, 'downloads': 4.0, 'comments': 8.0}
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WINDOW_DAYS = 7
+
+# Number of "virtual" average ratings every mod starts with
+TOP_RATED_PRIOR_VOTES = 5
+
+# Scores are stored at this precision
+SCORE_DIGITS = 4
+
+# ...and only rewritten once they move by more than this: every new rating
+# shifts the catalog-wide mean, and with it the top rated score of nearly
+# every mod (all the unrated ones) by a hair
+SCORE_TOLERANCE = 0.005
+
+
+def current_bucket(now=None):
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def record_events(kind, counts, now=None):
+    """Add {mod_id: n} events of one kind to the current hour's buckets"""
+    if kind not in EVENT_WEIGHTS:
+        raise ValueError(f"Unknown event kind: {kind!r}")
+    counts = {mod_id: n for mod_id, n in counts.items() if n}
+    if not counts:
+        return
+
+    from .models import Mod, ModActivity
+    bucket = current_bucket(now)
+    # Mods deleted since the events were buffered have nothing to count against
+    existing = Mod.objects.filter(pk__in=counts).order_by().values_list('pk', flat=True)
+    ModActivity.objects.bulk_create(
+        [ModActivity(mod_id=mod_id, bucket=bucket) for mod_id in existing], ignore_conflicts=True
+    )
+    ModActivity.objects.filter(bucket=bucket, mod_id__in=counts.keys()).update(
+        **{kind: increment_by(kind, counts, key='mod_id')}
+    )
+
+
+def trending_scores(now, batch_size=1000):
+    """{mod_id: decayed weighted event count} over the trending window"""
+    from .models import ModActivity
+
+    scores = defaultdict(float)
+    rows = ModActivity.objects.filter(bucket__gte=now - timedelta(days=TRENDING_WINDOW_DAYS)).values_list(
+        'mod_id', 'bucket', *EVENT_WEIGHTS
+    )
+    weights = list(EVENT_WEIGHTS.values())
+    for mod_id, bucket, *counts in rows.iterator(chunk_size=batch_size):
+        age_hours = max((now - bucket).total_seconds(), 0) / 3600
+        decay = 0.5 ** (age_hours / TRENDING_HALF_LIFE_HOURS)
+        scores[mod_id] += decay * sum(w * c for w, c in zip(weights, counts))
+    return scores
+
+
+def top_rated_score(rating_sum, rating_count, prior_mean):
+    return (rating_sum + TOP_RATED_PRIOR_VOTES * prior_mean) / (rating_count + TOP_RATED_PRIOR_VOTES)
+
+
+def moved(old, new):
+    return not math.isclose(old, new, rel_tol=0, abs_tol=SCORE_TOLERANCE)
+
+
+def compute_scores(now=None, batch_size=1000):
+    """Recompute both scores of every mod and prune expired buckets. Returns the number of mods changed."""
+    from .models import Mod, ModActivity
+
+    now = now or timezone.now()
+    ModActivity.objects.filter(bucket__lt=now - timedelta(days=TRENDING_WINDOW_DAYS)).delete()
+    trending = trending_scores(now, batch_size)
+
+    totals = Mod.objects.aggregate(total=models.Sum('rating_sum'), count=models.Sum('rating_count'))
+    prior_mean = totals['total'] / totals['count'] if totals['count'] else 0.0
+
+    changed = []
+    mods = Mod.objects.only('id', 'rating_sum', 'rating_count', 'trending_score', 'top_rated_score')
+    for mod in mods.iterator(chunk_size=batch_size):
+        scores = (
+            round(trending.get(mod.id, 0.0), SCORE_DIGITS),
+            round(top_rated_score(mod.rating_sum, mod.rating_count, prior_mean), SCORE_DIGITS),
+        )
+        if moved(mod.trending_score, scores[0]) or moved(mod.top_rated_score, scores[1]):
+            mod.trending_score, mod.top_rated_score = scores
+            changed.append(mod)
+
+    # updated_at stays: the scores only order list pages (versioned by the
+    # catalog generation invalidate_catalog bumps), details don't show them
+    with transaction.atomic():
+        Mod.objects.bulk_update(changed, ['trending_score', 'top_rated_score'], batch_size=batch_size)
+    if changed:
+        invalidate_catalog()
+    return len(changed)
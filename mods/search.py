@@ -0,0 +1,175 @@
+"""
+Full-text search for mods.
+
+On PostgreSQL each mod keeps a weighted ``search_vector`` (GIN indexed) that is
+refreshed whenever it is saved, and queries are ranked with ``SearchRank``.
+Other databases (SQLite in dev/test) use an in-process inverted index built
+from the same fields and weights.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+
+# Field -> Postgres weight class; the Python index uses Postgres' default
+# weight values for the same classes so rankings roughly agree.
+SEARCH_FIELDS = {'title': 'A', 'uploader_name': 'B', 'description': 'C'}
+WEIGHT_VALUES = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+SEARCH_CONFIG = 'english'
+
+# The in-memory fallback ranks in SQL with one CASE branch per hit, so it
+# only returns the best matches
+FALLBACK_RESULT_LIMIT = 200
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def build_search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in SEARCH_FIELDS.items():
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+class InvertedIndex:
+    """token -> {mod_id: weighted term frequency}, built lazily from the mods table"""
+
+    def __init__(self):
+        self._postings = defaultdict(dict)
+        self._terms_by_mod = {}
+        self._lock = threading.Lock()
+        self._built = False
+
+    def _document_terms(self, values):
+        terms = defaultdict(float)
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(values.get(field)):
+                terms[token] += WEIGHT_VALUES[weight]
+        return terms
+
+    def _add(self, mod_id, values):
+        self._remove(mod_id)
+        terms = self._document_terms(values)
+        for token, score in terms.items():
+            self._postings[token][mod_id] = score
+        self._terms_by_mod[mod_id] = list(terms)
+
+    def _remove(self, mod_id):
+        for token in self._terms_by_mod.pop(mod_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(mod_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def _ensure_built(self, model):
+        if self._built:
+            return
+        for row in model.objects.values('pk', *SEARCH_FIELDS).iterator():
+            self._add(row['pk'], row)
+        self._built = True
+
+    def update(self, mods):
+        with self._lock:
+            if not self._built:
+                return  # Picked up by the initial build
+            for mod in mods:
+                self._add(mod.pk, {field: getattr(mod, field) for field in SEARCH_FIELDS})
+
+    def remove(self, mod_id):
+        with self._lock:
+            self._remove(mod_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings.clear()
+            self._terms_by_mod.clear()
+            self._built = False
+
+    def search(self, model, query):
+        """Return {mod_id: score} for mods containing every query term"""
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+        with self._lock:
+            self._ensure_built(model)
+            total = max(len(self._terms_by_mod), 1)
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return {}
+            postings.sort(key=len)
+            scores = {}
+            for mod_id in postings[0]:
+                if all(mod_id in p for p in postings[1:]):
+                    scores[mod_id] = sum(
+                        p[mod_id] * math.log(1 + total / len(p)) for p in postings
+                    )
+            return scores
+
+
+inverted_index = InvertedIndex()
+
+
+def index_mods(mods):
+    """Refresh the search data of the given (saved) mods"""
+    mods = list(mods)
+    if not mods:
+        return
+    if uses_postgres():
+        model = type(mods[0])
+        model.objects.filter(pk__in=[m.pk for m in mods]).update(search_vector=build_search_vector())
+    else:
+        inverted_index.update(mods)
+
+
+def unindex_mod(mod_id):
+    if not uses_postgres():
+        inverted_index.remove(mod_id)
+
+
+def search_mods(queryset, query):
+    """Filter queryset to mods matching query, best matches first"""
+    query = (query or '').strip()
+    if not query:
+        return queryset
+
+    if uses_postgres():
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(models.F('search_vector'), search_query))
+            .order_by('-search_rank', '-created_at')
+        )
+
+    scores = inverted_index.search(queryset.model, query)
+    if not scores:
+        return queryset.none()
+    ranked = sorted(scores, key=scores.get, reverse=True)[:FALLBACK_RESULT_LIMIT]
+
+    # One raw CASE over the pk column; building a When() per hit costs more
+    # than the query itself
+    model = queryset.model
+    pk_field = model._meta.pk
+    qn = connection.ops.quote_name
+    column = f'{qn(model._meta.db_table)}.{qn(pk_field.column)}'
+    params = []
+    for mod_id in ranked:
+        params += [pk_field.get_db_prep_value(mod_id, connection), scores[mod_id]]
+    rank = RawSQL(f"CASE {column} {' '.join(['WHEN %s THEN %s'] * len(ranked))} END", params,
+                  output_field=models.FloatField())
+    return queryset.filter(pk__in=ranked).annotate(search_rank=rank).order_by('-search_rank', '-created_at')
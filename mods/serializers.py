@@ -1,15 +1,48 @@
+from django.db import transaction
+from django.urls import reverse
+from django.utils.text import slugify
 from rest_framework import serializers
-from .models import Mod, DownloadLink, ModImage, Comment
+from categories.models import Category
+from core.cache import invalidate_catalog
+from core.instrumentation import timed_data
+from core.slugs import create_with_unique_slugs
+from . import search
+from .models import Mod, DownloadLink, ModImage, Comment, DLC, GameVersion
+from .services import parse_version
+
+# Comments embedded in a mod detail response; the rest are paginated
+# through /comments/?mod=<slug>
+LATEST_COMMENTS = 10
+
+# Largest batch accepted by the bulk upload endpoint
+BULK_UPLOAD_LIMIT = 1000
 
 class DownloadLinkSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
     class Meta:
         model = DownloadLink
-        fields = ['id', 'name', 'url', 'file_size']
+        fields = ['id', 'name', 'url', 'file_size', 'click_count', 'download_url']
+
+    def get_download_url(self, obj):
+        # Counted redirect to `url`
+        return reverse('download-link-detail', args=[obj.pk])
 
 class ModImageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ModImage
-        fields = ['id', 'mod', 'image', 'is_cover']
+        fields = ['id', 'mod', 'image', 'is_cover', 'thumbnail', 'medium', 'processing_status']
+        read_only_fields = ['thumbnail', 'medium', 'processing_status']
+
+class DLCSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DLC
+        fields = ['id', 'name', 'slug']
+
+class GameVersionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GameVersion
+        fields = ['id', 'version', 'released_at']
 
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,45 +52,252 @@ class CommentSerializer(serializers.ModelSerializer):
 class ModListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for lists (cover image only)"""
     cover_image = serializers.SerializerMethodField()
+    cover_thumbnail = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
 
     class Meta:
         model = Mod
-        fields = ['id', 'title', 'slug', 'uploader_name', 'cover_image', 'category_name', 'created_at', 'view_count', 'average_rating', 'rating_count', 'status']
+        fields = ['id', 'title', 'slug', 'uploader_name', 'cover_image', 'cover_thumbnail', 'category_name', 'created_at', 'view_count', 'download_count', 'average_rating', 'rating_count', 'status']
 
     def get_cover_image(self, obj):
-        cover = obj.images.filter(is_cover=True).first()
-        if not cover:
-            cover = obj.images.first()
+        # Mod.cover_image is select_related by ModViewSet for list pages
+        cover = obj.cover_image
         return cover.image.url if cover else None
 
+    def get_cover_thumbnail(self, obj):
+        # Small WebP for cards; the full image until the variant is rendered
+        cover = obj.cover_image
+        if not cover:
+            return None
+        return (cover.thumbnail or cover.image).url
+
 class ModDetailSerializer(serializers.ModelSerializer):
     """Full details including all images and links"""
     download_links = DownloadLinkSerializer(many=True, read_only=True)
     images = ModImageSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
 
     class Meta:
         model = Mod
-        fields = '__all__'
+        # Search and ranking internals, and the cover (images lists it)
+        exclude = ['search_vector', 'rating_sum', 'trending_score', 'top_rated_score', 'cover_image']
+
+    def get_comments(self, obj):
+        # Prefetched by ModViewSet.get_queryset for detail actions
+        comments = getattr(obj, 'latest_comments', None)
+        if comments is None:
+            comments = obj.comments.all()[:LATEST_COMMENTS]
+        return CommentSerializer(comments, many=True).data
+
+    def get_comment_count(self, obj):
+        count = getattr(obj, 'comment_count', None)
+        return obj.comments.count() if count is None else count
+
+# DRF's own formatting for the values the row serializers emit
+_datetime = serializers.DateTimeField()
+
+
+class RowSerializer:
+    """
+    Read-only fast path over `.values()` rows: builds the response dicts
+    directly instead of running DRF's field machinery for every object.
+    Subclasses produce exactly what their ModelSerializer twin would (see
+    the parity tests) and only support what the read views use.
+    """
+    # What the view selects with .values()
+    columns = ()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    # Not a DRF serializer, so instrument_serializers() doesn't reach it
+    @timed_data
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @staticmethod
+    def file_url(name, request=None):
+        # FileField.url without a FieldFile per value; all image fields share the storage
+        if not name:
+            return None
+        url = ModImage._meta.get_field('image').storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class ModListRowSerializer(RowSerializer):
+    """ModListSerializer for .values(*columns) rows"""
+    columns = (
+        'pk', 'title', 'slug', 'uploader_name', 'cover_image__image', 'cover_image__thumbnail', 'category__name',
+        'created_at', 'view_count', 'download_count', 'average_rating', 'rating_count', 'status',
+        # Not rendered, but cursor pagination reads the sort key of the edge rows
+        'trending_score', 'top_rated_score',
+    )
+
+    def to_representation(self, row):
+        cover = row['cover_image__image']
+        return {
+            'id': str(row['pk']),
+            'title': row['title'],
+            'slug': row['slug'],
+            'uploader_name': row['uploader_name'],
+            'cover_image': self.file_url(cover),
+            'cover_thumbnail': self.file_url(row['cover_image__thumbnail'] or cover),
+            'category_name': row['category__name'],
+            'created_at': _datetime.to_representation(row['created_at']),
+            'view_count': row['view_count'],
+            'download_count': row['download_count'],
+            'average_rating': row['average_rating'],
+            'rating_count': row['rating_count'],
+            'status': row['status'],
+        }
+
+
+class ModDetailRowSerializer(RowSerializer):
+    """
+    ModDetailSerializer for .values(*columns) rows annotated with
+    comment_count; the nested lists cost one query each
+    """
+    columns = (
+        'pk', 'category__name', 'title', 'slug', 'description', 'uploader_name', 'uploader_email', 'uploader_ip',
+        'youtube_url', 'version', 'status', 'created_at', 'updated_at', 'view_count', 'download_count',
+        'average_rating', 'rating_count', 'category', 'min_game_version', 'comment_count',
+    )
+
+    def to_representation(self, row):
+        pk = row['pk']
+        request = self.context.get('request')
+        links = DownloadLink.objects.filter(mod_id=pk).values('pk', 'name', 'url', 'file_size', 'click_count')
+        images = ModImage.objects.filter(mod_id=pk).values(
+            'pk', 'mod', 'image', 'is_cover', 'thumbnail', 'medium', 'processing_status'
+        )
+        comments = Comment.objects.filter(mod_id=pk).order_by('-created_at', '-pk').values(
+            'pk', 'user_name', 'content', 'rating', 'created_at'
+        )[:LATEST_COMMENTS]
+        return {
+            'id': str(pk),
+            'download_links': [{
+                'id': link['pk'],
+                'name': link['name'],
+                'url': link['url'],
+                'file_size': link['file_size'],
+                'click_count': link['click_count'],
+                'download_url': reverse('download-link-detail', args=[link['pk']]),
+            } for link in links],
+            'images': [{
+                'id': image['pk'],
+                'mod': image['mod'],
+                'image': self.file_url(image['image'], request),
+                'is_cover': image['is_cover'],
+                'thumbnail': self.file_url(image['thumbnail'], request),
+                'medium': self.file_url(image['medium'], request),
+                'processing_status': image['processing_status'],
+            } for image in images],
+            'comments': [{
+                'id': comment['pk'],
+                'user_name': comment['user_name'],
+                'content': comment['content'],
+                'rating': comment['rating'],
+                'created_at': _datetime.to_representation(comment['created_at']),
+            } for comment in comments],
+            'comment_count': row['comment_count'],
+            'category_name': row['category__name'],
+            'title': row['title'],
+            'slug': row['slug'],
+            'description': row['description'],
+            'uploader_name': row['uploader_name'],
+            'uploader_email': row['uploader_email'],
+            'uploader_ip': row['uploader_ip'],
+            'youtube_url': row['youtube_url'],
+            'version': row['version'],
+            'status': row['status'],
+            'created_at': _datetime.to_representation(row['created_at']),
+            'updated_at': _datetime.to_representation(row['updated_at']),
+            'view_count': row['view_count'],
+            'download_count': row['download_count'],
+            'average_rating': row['average_rating'],
+            'rating_count': row['rating_count'],
+            'category': row['category'],
+            'min_game_version': row['min_game_version'],
+            'required_dlcs': list(DLC.objects.filter(required_by=pk).values_list('pk', flat=True)),
+            'conflicts_with': list(Mod.objects.filter(conflicts_with=pk).values_list('pk', flat=True)),
+        }
+
+
+class CategoryField(serializers.PrimaryKeyRelatedField):
+    """Looks each category id up once per request, not once per mod in a bulk upload"""
+
+    def to_internal_value(self, data):
+        resolved = self.context.setdefault('resolved_categories', {})
+        key = str(data)
+        if key not in resolved:
+            resolved[key] = super().to_internal_value(data)
+        return resolved[key]
+
+
+class ModBulkCreateSerializer(serializers.ListSerializer):
+    """Creates a whole batch of mods and their links in one transaction"""
+
+    def create(self, validated_data):
+        mods, links = [], []
+        for item in validated_data:
+            item = dict(item)
+            links_data = item.pop('download_links', [])
+            mod = Mod(status='pending', **item)
+            mods.append(mod)
+            links += [DownloadLink(mod=mod, **link) for link in links_data]
+
+        bases = [slugify(mod.title) or f"mod-{str(mod.id)[:8]}" for mod in mods]
+
+        def create():
+            Mod.objects.bulk_create(mods)
+            DownloadLink.objects.bulk_create(links)
+
+        create_with_unique_slugs(mods, bases, create)
+
+        # bulk_create skips Mod.save, so do its side effects once for the batch
+        search.index_mods(mods)
+        invalidate_catalog()
+        return mods
+
 
 class ModCreateSerializer(serializers.ModelSerializer):
     """Serializer for uploading (creating) a mod"""
     download_links = serializers.ListField(
         child=serializers.DictField(), write_only=True
     )
+    category = CategoryField(queryset=Category.objects.all())
     
     class Meta:
         model = Mod
         fields = ['id', 'slug', 'title', 'description', 'category', 'uploader_name', 'uploader_email', 'youtube_url', 'version', 'download_links']
         read_only_fields = ['id', 'slug', 'uploader_ip']
+        list_serializer_class = ModBulkCreateSerializer
 
     def create(self, validated_data):
         links_data = validated_data.pop('download_links', [])
-        mod = Mod.objects.create(status='pending', **validated_data)
-        
-        for link in links_data:
-            DownloadLink.objects.create(mod=mod, **link)
-            
-        return mod
\ No newline at end of file
+        with transaction.atomic():
+            mod = Mod.objects.create(status='pending', **validated_data)
+            DownloadLink.objects.bulk_create([DownloadLink(mod=mod, **link) for link in links_data])
+        return mod
+
+class CompatibilityCheckSerializer(serializers.Serializer):
+    """A user's setup: game version, owned DLC ids and installed mod ids"""
+    game_version = serializers.CharField(max_length=20)
+    dlcs = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    mods = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=BULK_UPLOAD_LIMIT)
+
+    def validate_game_version(self, value):
+        try:
+            parse_version(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
@@ -1,40 +1,97 @@
-from .models import Mod, DLC
+import re
+from collections import defaultdict
+from .models import Mod
 
-def check_compatibility(mod, user_version, user_dlc_ids, user_mod_ids=None):
-    issues = []
-    status = 'compatible'
-    
-    # 1. Check Game Version
-    # Simple string comparison (In production, use semver)
-    if user_version < mod.min_game_version:
-        status = 'incompatible'
-        issues.append({
-            'type': 'version',
-            'message': f"Requires game version {mod.min_game_version}+. You have {user_version}."
-        })
-
-    # 2. Check DLCs
-    required_dlc_ids = set(mod.required_dlcs.values_list('id', flat=True))
+VERSION_PART = re.compile(r'(\d+)')
+
+
+def parse_version(value):
+    """
+    "1.49.3.14s" -> (1, 49, 3, 14). Trailing zero parts are dropped so that
+    1.49 and 1.49.0 compare equal; suffixes like "s" (Steam) are ignored.
+    """
+    parts = []
+    for chunk in str(value).strip().split('.'):
+        match = VERSION_PART.match(chunk)
+        if not match:
+            break
+        parts.append(int(match.group(1)))
+    if not parts:
+        raise ValueError(f"Invalid game version: {value!r}")
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def parse_stored_version(value):
+    """
+    parse_version() of a stored GameVersion; rows entered before the field
+    was validated may not parse and then don't restrict anything
+    """
+    try:
+        return parse_version(value)
+    except ValueError:
+        return ()
+
+
+def check_mods_compatibility(mods, user_version, user_dlc_ids, user_mod_ids=None):
+    """
+    Check many mods at once. Required DLCs and conflicts for the whole batch
+    are loaded in two queries and evaluated with in-memory sets.
+    Returns {mod.id: {'status': ..., 'issues': [...]}}.
+    """
+    mods = list(mods)
+    mod_ids = [mod.id for mod in mods]
+    user_version = parse_version(user_version)
     owned_dlc_ids = set(user_dlc_ids)
-    missing_dlcs = required_dlc_ids - owned_dlc_ids
-    
-    if missing_dlcs:
-        status = 'incompatible'
-        missing_names = DLC.objects.filter(id__in=missing_dlcs).values_list('name', flat=True)
-        issues.append({
-            'type': 'dlc',
-            'message': f"Missing required DLCs: {', '.join(missing_names)}."
-        })
-
-    # 3. Check Mod Conflicts (if user provided installed mods)
-    if user_mod_ids:
-        conflicts = mod.conflicts_with.filter(id__in=user_mod_ids)
-        if conflicts.exists():
-            status = 'warning' # Conflicts might be fixable with load order
-            names = [c.title for c in conflicts]
+    installed = set(user_mod_ids or ())
+
+    required = defaultdict(dict)
+    links = Mod.required_dlcs.through.objects.filter(mod_id__in=mod_ids)
+    for mod_id, dlc_id, dlc_name in links.values_list('mod_id', 'dlc_id', 'dlc__name'):
+        required[mod_id][dlc_id] = dlc_name
+
+    conflicts = defaultdict(list)
+    if installed:
+        pairs = Mod.conflicts_with.through.objects.filter(from_mod_id__in=mod_ids, to_mod_id__in=installed)
+        for mod_id, title in pairs.values_list('from_mod_id', 'to_mod__title'):
+            conflicts[mod_id].append(title)
+
+    results = {}
+    for mod in mods:
+        issues = []
+        status = 'compatible'
+
+        # 1. Check Game Version
+        min_version = mod.min_game_version
+        if min_version and user_version < parse_stored_version(min_version.version):
+            status = 'incompatible'
+            issues.append({
+                'type': 'version',
+                'message': f"Requires game version {min_version.version}+. You have {'.'.join(map(str, user_version))}."
+            })
+
+        # 2. Check DLCs
+        missing = sorted(name for dlc_id, name in required[mod.id].items() if dlc_id not in owned_dlc_ids)
+        if missing:
+            status = 'incompatible'
+            issues.append({
+                'type': 'dlc',
+                'message': f"Missing required DLCs: {', '.join(missing)}."
+            })
+
+        # 3. Check Mod Conflicts (if user provided installed mods)
+        if conflicts[mod.id]:
+            if status == 'compatible':
+                status = 'warning'  # Conflicts might be fixable with load order
             issues.append({
                 'type': 'conflict',
-                'message': f"Conflicts with installed mods: {', '.join(names)}."
+                'message': f"Conflicts with installed mods: {', '.join(sorted(conflicts[mod.id]))}."
             })
 
-    return {'status': status, 'issues': issues}
\ No newline at end of file
+        results[mod.id] = {'status': status, 'issues': issues}
+    return results
+
+
+def check_compatibility(mod, user_version, user_dlc_ids, user_mod_ids=None):
+    return check_mods_compatibility([mod], user_version, user_dlc_ids, user_mod_ids)[mod.id]
@@ -0,0 +1,31 @@
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from core.cache import invalidate_catalog
+from . import search
+from .models import Mod, ModImage, Comment
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_rating(sender, instance, **kwargs):
+    # Also fires for queryset/admin bulk deletes, unlike Comment.delete()
+    if instance.rating > 0:
+        Mod.apply_rating_delta(instance.mod_id, sum_delta=-instance.rating, count_delta=-1)
+    else:
+        # Last-Modified is the newer of updated_at and the latest comment:
+        # without this it would fall back to an older comment
+        Mod.objects.filter(pk=instance.mod_id).update(updated_at=Now())
+    invalidate_catalog()
+
+
+@receiver(post_delete, sender=Mod)
+def unindex_mod(sender, instance, **kwargs):
+    search.unindex_mod(instance.pk)
+    invalidate_catalog()
+
+
+@receiver(post_delete, sender=ModImage)
+def image_deleted(sender, instance, **kwargs):
+    # The FK was nulled by the delete; fall back to the next image
+    Mod.refresh_cover(instance.mod_id)
+    invalidate_catalog()
@@ -1,3 +1,1083 @@
-from django.test import TestCase
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO, StringIO
+import shutil
+import tempfile
+import uuid
+from unittest import mock, skipIf
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import parse_http_date
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from categories.models import Category
+from core.models import User
+from . import ranking, search
+from core.cache import cache_stats
+from core.slugs import allocate_slugs
+from .counters import download_counter, view_counter
+from .models import Mod, ModActivity, ModImage, Comment, DownloadLink, DLC, GameVersion
+from .serializers import (
+    LATEST_COMMENTS, ModDetailRowSerializer, ModDetailSerializer, ModListRowSerializer, ModListSerializer
+)
+from .services import parse_version
 
-# Create your tests here.
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0, DOWNLOAD_COUNT_FLUSH_INTERVAL=0)
+class CatalogTestCase(TestCase):
+    def setUp(self):
+        # Cached responses and buffered counts would outlive the rolled back test data
+        cache.clear()
+        self.addCleanup(view_counter.flush)
+        self.addCleanup(download_counter.flush)
+
+
+class ModListQueryTests(CatalogTestCase):
+    # Pagination COUNT + the page itself; must not grow with page size
+    LIST_QUERY_BUDGET = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Trucks')
+        for i in range(12):
+            mod = Mod.objects.create(
+                title=f'Mod {i}', description='desc', category=cls.category, status='published'
+            )
+            ModImage.objects.create(mod=mod, image=f'mod_images/{i}-a.jpg')
+            ModImage.objects.create(mod=mod, image=f'mod_images/{i}-b.jpg', is_cover=True)
+
+    def test_list_query_budget(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/mods/items/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 12)
+        self.assertLessEqual(len(ctx.captured_queries), self.LIST_QUERY_BUDGET)
+
+        first = response.json()['results'][0]
+        self.assertTrue(first['cover_image'].endswith('mod_images/11-b.jpg'))
+        self.assertEqual(first['category_name'], 'Trucks')
+
+    def test_list_cover_falls_back_to_first_image(self):
+        buses = Category.objects.create(name='Buses')
+        mod = Mod.objects.create(title='No cover', description='desc', category=buses, status='published')
+        ModImage.objects.create(mod=mod, image='mod_images/first.jpg')
+        ModImage.objects.create(mod=mod, image='mod_images/second.jpg')
+        Mod.objects.create(title='No images', description='desc', category=buses, status='published')
+
+        response = self.client.get('/api/mods/items/', {'category': 'buses'})
+        results = {m['slug']: m for m in response.json()['results']}
+        self.assertTrue(results['no-cover']['cover_image'].endswith('mod_images/first.jpg'))
+        self.assertIsNone(results['no-images']['cover_image'])
+
+
+class ModCoverTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Volvo FH', description='desc', category=category)
+        self.first = ModImage.objects.create(mod=self.mod, image='mod_images/first.jpg')
+        self.second = ModImage.objects.create(mod=self.mod, image='mod_images/second.jpg', is_cover=True)
+
+    def cover_id(self):
+        return Mod.objects.values_list('cover_image', flat=True).get(pk=self.mod.pk)
+
+    def test_cover_reference_follows_switches(self):
+        self.assertEqual(self.cover_id(), self.second.pk)
+
+        self.first.is_cover = True
+        self.first.save()
+        self.assertEqual(self.cover_id(), self.first.pk)
+        self.assertEqual(list(self.mod.images.filter(is_cover=True)), [self.first])
+
+        self.first.is_cover = False
+        self.first.save()
+        self.assertEqual(self.cover_id(), self.first.pk)  # Oldest image without an explicit cover
+
+    def test_resaving_cover_leaves_siblings_alone(self):
+        cover = ModImage.objects.get(pk=self.second.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            cover.save()
+        image_updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "mods_modimage"')]
+        self.assertEqual(len(image_updates), 1)
+
+    def test_deleting_cover_falls_back_to_next_image(self):
+        self.second.delete()
+        self.assertEqual(self.cover_id(), self.first.pk)
+        self.first.delete()
+        self.assertIsNone(self.cover_id())
+
+    def test_database_allows_one_cover_per_mod(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ModImage.objects.filter(pk=self.first.pk).update(is_cover=True)
+
+
+class ModViewCountTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=category, status='published')
+
+    def test_retrieve_does_not_write(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/mods/items/{self.mod.slug}/')
+        self.assertEqual(response.json()['view_count'], 1)
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')])
+        self.mod.refresh_from_db()
+        self.assertEqual(self.mod.view_count, 0)
+
+    def test_background_flush_logs_failures(self):
+        view_counter.record(self.mod.id)
+        with mock.patch.object(view_counter, 'write', side_effect=OperationalError('unable to open database file')), \
+                self.assertLogs('mods.counters', 'ERROR'):
+            view_counter.flush_in_background()
+        # Kept for the next flush
+        self.assertEqual(view_counter.pending(self.mod.id), 1)
+
+    def test_cached_detail_counts_survive_flush(self):
+        link = DownloadLink.objects.create(mod=self.mod, name='Mirror', url='https://example.com/f.zip', file_size='1 MB')
+        detail = f'/api/mods/items/{self.mod.slug}/'
+        views = [self.client.get(detail).json()['view_count'] for _ in range(3)]
+        self.assertEqual(views, [1, 2, 3])
+        download_counter.record(link.pk, self.mod.pk)
+        self.assertEqual(self.client.get(detail).json()['download_count'], 1)
+
+        # The flush moves the buffered counts into the row the cached payload predates
+        view_counter.flush()
+        download_counter.flush()
+        response = self.client.get(detail)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual((response.json()['view_count'], response.json()['download_count']), (5, 1))
+        self.assertEqual(self.client.get(detail).json()['view_count'], 6)
+
+    def test_flush_applies_buffered_views(self):
+        other = Mod.objects.create(title='Volvo', description='desc', category=self.mod.category, status='published')
+        for _ in range(3):
+            self.client.get(f'/api/mods/items/{self.mod.slug}/')
+        self.client.get(f'/api/mods/items/{other.slug}/')
+
+        # One view_count UPDATE plus the trending bucket upsert (3 statements),
+        # in a savepoint, however many mods are pending
+        with self.assertNumQueries(6):
+            self.assertEqual(view_counter.flush(), 2)
+        self.mod.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.mod.view_count, 3)
+        self.assertEqual(other.view_count, 1)
+        self.assertEqual(view_counter.flush(), 0)
+
+
+class ModRatingTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=category, status='published')
+
+    def assertRating(self, average, count, total):
+        self.mod.refresh_from_db()
+        self.assertEqual(
+            (self.mod.average_rating, self.mod.rating_count, self.mod.rating_sum), (average, count, total)
+        )
+
+    def test_post_comment_updates_rating(self):
+        self.client.post('/api/mods/comments/', {'mod_id': str(self.mod.id), 'content': 'Great', 'rating': 5})
+        self.client.post('/api/mods/comments/', {'mod_id': str(self.mod.id), 'content': 'Ok', 'rating': 4})
+        self.client.post('/api/mods/comments/', {'mod_id': str(self.mod.id), 'content': 'No rating'})
+        self.assertRating(4.5, 2, 9)
+
+    def test_edit_and_delete_adjust_rating(self):
+        first = Comment.objects.create(mod=self.mod, content='a', rating=5)
+        second = Comment.objects.create(mod=self.mod, content='b', rating=2)
+        self.assertRating(3.5, 2, 7)
+
+        second = Comment.objects.get(pk=second.pk)
+        second.rating = 0
+        second.save()
+        self.assertRating(5.0, 1, 5)
+
+        Comment.objects.filter(pk=first.pk).delete()
+        self.assertRating(0.0, 0, 0)
+
+    def test_recompute_ratings_repairs_aggregates(self):
+        Comment.objects.create(mod=self.mod, content='a', rating=3)
+        Comment.objects.create(mod=self.mod, content='b', rating=4)
+        Mod.objects.filter(pk=self.mod.pk).update(average_rating=1.0, rating_count=9, rating_sum=9)
+
+        call_command('recompute_ratings', stdout=StringIO())
+        self.assertRating(3.5, 2, 7)
+
+
+class ModRankingTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+        self.now = timezone.now()
+
+    def make_mod(self, title):
+        return Mod.objects.create(title=title, description='desc', category=self.category, status='published')
+
+    def ordered_slugs(self, ordering):
+        response = self.client.get('/api/mods/items/', {'ordering': ordering})
+        return [m['slug'] for m in response.json()['results']]
+
+    def test_views_and_comments_fill_hourly_buckets(self):
+        mod = self.make_mod('Scania')
+        self.client.get(f'/api/mods/items/{mod.slug}/')
+        self.client.get(f'/api/mods/items/{mod.slug}/')
+        view_counter.flush()
+        self.client.post('/api/mods/comments/', {'mod_id': str(mod.id), 'content': 'Nice'})
+
+        activity = ModActivity.objects.get(mod=mod)
+        self.assertEqual((activity.views, activity.comments, activity.downloads), (2, 1, 0))
+        self.assertEqual(activity.bucket, ranking.current_bucket())
+
+    def test_trending_decays_with_age(self):
+        old, fresh = self.make_mod('Old hit'), self.make_mod('Fresh')
+        ranking.record_events('views', {old.id: 10}, now=self.now - timedelta(days=3))
+        ranking.record_events('views', {fresh.id: 4}, now=self.now)
+
+        ranking.compute_scores(now=self.now)
+        old.refresh_from_db()
+        self.assertLess(old.trending_score, 10 * 0.5 ** 2)  # More than two half-lives old
+        self.assertEqual(self.ordered_slugs('-trending_score')[:2], ['fresh', 'old-hit'])
+
+    def test_top_rated_discounts_few_votes(self):
+        lucky, solid, meh = self.make_mod('Lucky'), self.make_mod('Solid'), self.make_mod('Meh')
+        Comment.objects.create(mod=lucky, content='x', rating=5)
+        for rating in [5, 4] * 10:
+            Comment.objects.create(mod=solid, content='x', rating=rating)
+        for _ in range(20):
+            Comment.objects.create(mod=meh, content='x', rating=3)
+
+        ranking.compute_scores(now=self.now)
+        self.assertEqual(self.ordered_slugs('-top_rated_score')[:2], ['solid', 'lucky'])
+        self.assertEqual(self.ordered_slugs('-average_rating')[:2], ['lucky', 'solid'])
+
+    def test_batch_only_rewrites_changed_mods_and_prunes_buckets(self):
+        mod = self.make_mod('Scania')
+        ranking.record_events('views', {mod.id: 3}, now=self.now - timedelta(days=ranking.TRENDING_WINDOW_DAYS + 1))
+        ranking.record_events('downloads', {mod.id: 1}, now=self.now)
+
+        out = StringIO()
+        call_command('compute_rankings', stdout=out)
+        self.assertIn('1 mod(s) changed', out.getvalue())
+        self.assertEqual(ModActivity.objects.filter(mod=mod).count(), 1)
+        self.assertEqual(ranking.compute_scores(), 0)
+
+    def test_scores_leave_details_and_small_shifts_alone(self):
+        rated, unrated = self.make_mod('Rated'), self.make_mod('Unrated')
+        Mod.objects.filter(pk=rated.pk).update(rating_count=400, rating_sum=1600)
+        updated_at = dict(Mod.objects.values_list('pk', 'updated_at'))
+        self.assertEqual(ranking.compute_scores(now=self.now), 2)
+        self.assertEqual(dict(Mod.objects.values_list('pk', 'updated_at')), updated_at)
+
+        # One more vote nudges the mean, and every mod's score, by 0.0025
+        Mod.objects.filter(pk=rated.pk).update(rating_count=401, rating_sum=1605)
+        self.assertEqual(ranking.compute_scores(now=self.now), 0)
+        unrated.refresh_from_db()
+        self.assertEqual(unrated.top_rated_score, 4.0)
+
+
+class ModSearchTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        search.inverted_index.reset()
+        self.category = Category.objects.create(name='Trucks')
+        self.scania = Mod.objects.create(
+            title='Scania R 2009', description='Classic truck with V8 sound', category=self.category, status='published'
+        )
+        self.volvo = Mod.objects.create(
+            title='Volvo FH16', description='Includes a Scania style grill', category=self.category, status='published'
+        )
+        Mod.objects.create(title='Hidden Scania', description='desc', category=self.category, status='pending')
+
+    def slugs(self, params):
+        return [m['slug'] for m in self.client.get('/api/mods/items/', params).json()['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.slugs({'search': 'scania'}), ['scania-r-2009', 'volvo-fh16'])
+        self.assertEqual(self.slugs({'q': 'scania'}), ['scania-r-2009', 'volvo-fh16'])
+
+    def test_search_requires_every_term(self):
+        self.assertEqual(self.slugs({'q': 'scania v8'}), ['scania-r-2009'])
+        self.assertEqual(self.slugs({'q': 'scania daf'}), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(self.slugs({'q': 'fh16'}), ['volvo-fh16'])
+        self.volvo.title = 'Volvo FH 2022'
+        self.volvo.save()
+        self.assertEqual(self.slugs({'q': 'fh16'}), [])
+        self.assertEqual(self.slugs({'q': '2022'}), ['volvo-fh16'])
+
+        self.volvo.delete()
+        self.assertEqual(self.slugs({'q': 'scania'}), ['scania-r-2009'])
+
+
+class ModCursorPaginationTests(CatalogTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Trucks')
+        for i in range(30):
+            # Few distinct view counts so ties straddle page boundaries
+            Mod.objects.create(
+                title=f'Mod {i}', description='desc', category=category, status='published', view_count=i % 4
+            )
+
+    def walk(self, params):
+        slugs, url, params = [], '/api/mods/items/', dict(params, pagination='cursor')
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(url, params).json()
+            self.assertNotIn('count', data)
+            self.assertFalse([q for q in ctx.captured_queries if 'COUNT(' in q['sql']])
+            pages.append(data)
+            slugs += [m['slug'] for m in data['results']]
+            url, params = data['next'], None
+        return slugs, pages
+
+    def test_cursor_pages_match_full_ordering(self):
+        cases = {
+            '-created_at': ('-created_at', '-pk'),
+            'view_count': ('view_count', 'pk'),
+            '-view_count': ('-view_count', '-pk'),
+        }
+        for ordering, order_by in cases.items():
+            expected = list(Mod.objects.order_by(*order_by).values_list('slug', flat=True))
+            slugs, pages = self.walk({'ordering': ordering})
+            self.assertEqual(len(pages), 3)
+            self.assertEqual(slugs, expected, ordering)
+
+    def test_previous_link_returns_prior_page(self):
+        _, pages = self.walk({'ordering': '-view_count'})
+        self.assertIsNone(pages[0]['previous'])
+        data = self.client.get(pages[2]['previous']).json()
+        self.assertEqual(data['results'], pages[1]['results'])
+        self.assertIsNotNone(data['next'])
+
+    def test_page_number_mode_is_default(self):
+        data = self.client.get('/api/mods/items/').json()
+        self.assertEqual(data['count'], 30)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/mods/items/', {'cursor': 'nope'}).status_code, 404)
+
+        def cursor(*payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        pk = str(Mod.objects.values_list('pk', flat=True).first())
+        cursors = [
+            ({}, cursor('not-a-date', 'x', False)),
+            ({}, cursor({'a': 1}, pk, False)),
+            ({}, cursor(None, pk, False)),
+            ({}, cursor('2024-01-01T00:00:00+00:00', 'not-a-uuid', False)),
+            ({}, cursor('2024-01-01T00:00:00+00:00', [pk], False)),
+            ({'ordering': '-view_count'}, cursor('many', pk, False)),
+            ({'ordering': '-average_rating'}, cursor([1.5], pk, False)),
+            ({}, cursor(1, 2)),
+        ]
+        for params, encoded in cursors:
+            with self.subTest(params=params, cursor=encoded):
+                response = self.client.get('/api/mods/items/', {**params, 'cursor': encoded})
+                self.assertEqual(response.status_code, 404)
+
+
+class CatalogCacheTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=self.category, status='published')
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get('/api/mods/items/', {'ordering': '-view_count'})
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/mods/items/', {'ordering': '-view_count'})
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(cache_stats(), {'hits': 1, 'misses': 1})
+
+        # Different query params are cached separately
+        self.assertEqual(self.client.get('/api/mods/items/', {'ordering': 'view_count'})['X-Cache'], 'MISS')
+
+    def test_writes_invalidate_cached_responses(self):
+        detail = f'/api/mods/items/{self.mod.slug}/'
+        writes = [
+            lambda: Comment.objects.create(mod=self.mod, content='Nice', rating=5),
+            lambda: ModImage.objects.create(mod=self.mod, image='mod_images/a.jpg', is_cover=True),
+            lambda: Mod.objects.create(title='Volvo', description='desc', category=self.category, status='published'),
+            lambda: self.mod.save(),
+        ]
+        for write in writes:
+            self.client.get(detail)
+            self.client.get('/api/mods/items/')
+            self.assertEqual(self.client.get(detail)['X-Cache'], 'HIT')
+            write()
+            self.assertEqual(self.client.get(detail)['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get('/api/mods/items/')['X-Cache'], 'MISS')
+
+    def test_cached_detail_still_counts_views(self):
+        detail = f'/api/mods/items/{self.mod.slug}/'
+        counts = [self.client.get(detail).json()['view_count'] for _ in range(3)]
+        self.assertEqual(counts, [1, 2, 3])
+
+
+class ModConditionalGetTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=self.category, status='published')
+        self.detail = f'/api/mods/items/{self.mod.slug}/'
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.detail)
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            repeat = self.client.get(self.detail, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat['ETag'], response['ETag'])
+
+    def test_detail_etag_changes_with_content(self):
+        etag = self.client.get(self.detail)['ETag']
+        changes = [
+            lambda: Comment.objects.create(mod=self.mod, content='No rating'),
+            lambda: ModImage.objects.create(mod=self.mod, image='mod_images/a.jpg'),
+            lambda: Comment.objects.filter(mod=self.mod).delete(),
+        ]
+        for change in changes:
+            change()
+            response = self.client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_last_modified_moves_forward_when_newest_comment_is_deleted(self):
+        now = timezone.now()
+        Comment.objects.create(mod=self.mod, content='Older')
+        newest = Comment.objects.create(mod=self.mod, content='No rating')
+        Comment.objects.filter(content='Older').update(created_at=now - timedelta(minutes=20))
+        Comment.objects.filter(pk=newest.pk).update(created_at=now - timedelta(minutes=10))
+        Mod.objects.filter(pk=self.mod.pk).update(updated_at=now - timedelta(hours=1))
+        response = self.client.get(self.detail)
+
+        newest.delete()
+        again = self.client.get(self.detail, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json()['comment_count'], 1)
+        self.assertGreater(parse_http_date(again['Last-Modified']), parse_http_date(response['Last-Modified']))
+
+    def test_detail_etag_changes_when_variants_render(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        storage = override_settings(
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=media_root,
+            IMAGE_PIPELINE_RUNNER='sync',
+        )
+        storage.enable()
+        self.addCleanup(storage.disable)
+        buffer = BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(buffer, 'PNG')
+        with self.captureOnCommitCallbacks() as callbacks:
+            ModImage.objects.create(mod=self.mod, image=SimpleUploadedFile('shot.png', buffer.getvalue()))
+        response = self.client.get(self.detail)
+        self.assertEqual(response.json()['images'][0]['processing_status'], 'pending')
+
+        for callback in callbacks:
+            callback()
+        stale = self.client.get(self.detail, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(stale.status_code, 200)
+        self.assertTrue(stale.json()['images'][0]['thumbnail'].endswith('-thumbnail.webp'))
+
+    def test_list_not_modified(self):
+        response = self.client.get('/api/mods/items/', {'ordering': '-view_count'})
+        with self.assertNumQueries(0):
+            repeat = self.client.get(
+                '/api/mods/items/', {'ordering': '-view_count'}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(repeat.status_code, 304)
+
+        other_page = self.client.get('/api/mods/items/', {'ordering': 'view_count'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(other_page.status_code, 200)
+
+        Mod.objects.filter(pk=self.mod.pk).delete()
+        changed = self.client.get('/api/mods/items/', {'ordering': '-view_count'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_unknown_slug_is_404(self):
+        self.assertEqual(self.client.get('/api/mods/items/nope/').status_code, 404)
+
+
+class ModDetailTests(CatalogTestCase):
+    # ETag validator, mod + category, links, images, DLCs, conflicts, latest comments
+    DETAIL_QUERY_BUDGET = 7
+
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=category, status='published')
+        self.other = Mod.objects.create(title='Volvo', description='desc', category=category, status='published')
+        for i in range(3):
+            DownloadLink.objects.create(mod=self.mod, name=f'Mirror {i}', url='https://example.com/f.zip', file_size='1 MB')
+            ModImage.objects.create(mod=self.mod, image=f'mod_images/{i}.jpg')
+        for i in range(25):
+            Comment.objects.create(mod=self.mod, content=f'Comment {i}')
+        Comment.objects.create(mod=self.other, content='Elsewhere')
+
+    def test_detail_embeds_latest_comments_in_fixed_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(f'/api/mods/items/{self.mod.slug}/').json()
+        self.assertLessEqual(len(ctx.captured_queries), self.DETAIL_QUERY_BUDGET)
+        self.assertEqual(len(data['download_links']), 3)
+        self.assertEqual(len(data['images']), 3)
+        self.assertEqual(data['comment_count'], 25)
+        self.assertEqual(
+            [c['content'] for c in data['comments']],
+            [f'Comment {i}' for i in range(24, 24 - LATEST_COMMENTS, -1)],
+        )
+
+    def test_comments_filtered_by_mod(self):
+        data = self.client.get('/api/mods/comments/', {'mod': self.mod.slug}).json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 12)
+        self.assertEqual(data['results'][0]['content'], 'Comment 24')
+
+        data = self.client.get('/api/mods/comments/', {'mod': self.other.slug, 'pagination': 'cursor'}).json()
+        self.assertEqual([c['content'] for c in data['results']], ['Elsewhere'])
+
+
+class RowSerializerParityTests(CatalogTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Trucks')
+        version = GameVersion.objects.create(version='1.49')
+        dlcs = [DLC.objects.create(name=name, slug=name.lower()) for name in ('Iberia', 'Nordic')]
+        cls.full = Mod.objects.create(
+            title='Scania', description='desc', category=category, status='published', uploader_name='Kim',
+            uploader_email='kim@example.com', uploader_ip='203.0.113.7', youtube_url='https://youtu.be/x',
+            version='1.2', min_game_version=version, view_count=40, average_rating=3.5, rating_count=2, rating_sum=7,
+        )
+        cls.bare = Mod.objects.create(title='Volvo', description='', category=category, status='published')
+        cls.full.required_dlcs.set(dlcs)
+        cls.full.conflicts_with.set([cls.bare])
+        for i in range(3):
+            DownloadLink.objects.create(mod=cls.full, name=f'Mirror {i}', url='https://example.com/f.zip', file_size='1 MB')
+            ModImage.objects.create(mod=cls.full, image=f'mod_images/{i}.jpg', is_cover=i == 1)
+        ModImage.objects.filter(image='mod_images/1.jpg').update(
+            thumbnail='mod_images/variants/1-t.webp', medium='mod_images/variants/1-m.webp', processing_status='ready'
+        )
+        for i in range(12):
+            Comment.objects.create(mod=cls.full, content=f'Comment {i}', rating=i % 6, user_name=f'User {i}')
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_list_rows_match_model_serializer(self):
+        mods = Mod.objects.select_related('category', 'cover_image')
+        rows = Mod.objects.values(*ModListRowSerializer.columns)
+        self.assertEqual(
+            self.render(ModListRowSerializer(rows, many=True).data),
+            self.render(ModListSerializer(mods, many=True).data),
+        )
+
+    def test_detail_rows_match_model_serializer(self):
+        context = {'request': RequestFactory().get('/api/mods/items/')}
+        rows = Mod.objects.annotate(comment_count=Count('comments')).values(*ModDetailRowSerializer.columns)
+        for mod in (self.full, self.bare):
+            with self.subTest(mod=mod.title):
+                data = ModDetailRowSerializer(rows.get(pk=mod.pk), context=context).data
+                self.assertEqual(
+                    self.render(data),
+                    self.render(ModDetailSerializer(Mod.objects.get(pk=mod.pk), context=context).data),
+                )
+                internal = {'search_vector', 'rating_sum', 'trending_score', 'top_rated_score', 'cover_image'}
+                self.assertFalse(internal & set(data))
+
+
+class ModDownloadTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=category, status='published')
+        self.mirror = DownloadLink.objects.create(
+            mod=self.mod, name='Mirror', url='https://example.com/scania.zip', file_size='1 MB'
+        )
+        self.other = DownloadLink.objects.create(
+            mod=self.mod, name='Drive', url='https://example.com/drive.zip', file_size='1 MB'
+        )
+
+    def test_redirect_buffers_clicks_without_writes(self):
+        url = f'/api/mods/downloads/{self.mirror.pk}/'
+        self.client.get(url)  # Warms the link cache
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://example.com/scania.zip')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.client.get(f'/api/mods/downloads/{self.other.pk}/')
+        self.assertEqual(download_counter.flush(), 2)
+        self.mirror.refresh_from_db()
+        self.mod.refresh_from_db()
+        self.assertEqual(self.mirror.click_count, 2)
+        self.assertEqual(self.mod.download_count, 3)
+        self.assertEqual(ModActivity.objects.get(mod=self.mod).downloads, 3)
+
+    def test_detail_links_point_at_redirect(self):
+        links = self.client.get(f'/api/mods/items/{self.mod.slug}/').json()['download_links']
+        self.assertEqual(
+            {link['download_url'] for link in links},
+            {f'/api/mods/downloads/{self.mirror.pk}/', f'/api/mods/downloads/{self.other.pk}/'},
+        )
+
+    def test_unpublished_links_are_hidden(self):
+        self.mod.status = 'pending'
+        self.mod.save()
+        self.assertEqual(self.client.get(f'/api/mods/downloads/{self.mirror.pk}/').status_code, 404)
+        self.assertEqual(download_counter.flush(), 0)
+
+
+@override_settings(
+    MIDDLEWARE=[m for m in settings.MIDDLEWARE if 'whitenoise' not in m],
+    CATALOG_CACHE_TIMEOUT=0,  # Compare fresh renders, not a payload cached by the first call
+)
+class AsyncReadViewTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.trucks = Category.objects.create(name='Trucks')
+        buses = Category.objects.create(name='Buses')
+        for i in range(14):
+            mod = Mod.objects.create(
+                title=f'Scania {i}', description='desc', category=self.trucks if i % 2 else buses, status='published'
+            )
+            ModImage.objects.create(mod=mod, image=f'mod_images/{i}.jpg', is_cover=True)
+            DownloadLink.objects.create(mod=mod, name='Mirror', url='https://example.com/f.zip', file_size='1 MB')
+            Comment.objects.create(mod=mod, content='Nice', rating=4)
+        self.mod = mod
+        Mod.objects.create(title='Hidden', description='desc', category=buses)
+
+    async def fetch(self, path, params=None, headers=None):
+        """The same request through config.urls (DRF) and config.urls_async"""
+        sync = await sync_to_async(self.client.get)(path, params, headers=headers)
+        with override_settings(ROOT_URLCONF='config.urls_async'):
+            served = await self.async_client.get(path, params, headers=headers)
+        return sync, served
+
+    async def assertSameResponse(self, path, params=None, headers=None):
+        sync, served = await self.fetch(path, params, headers)
+        self.assertEqual(served.status_code, sync.status_code)
+        self.assertEqual(served.content, sync.content)
+        for header in ('Content-Type', 'Allow', 'Vary', 'ETag', 'X-Cache'):
+            self.assertEqual(served.get(header), sync.get(header), header)
+
+    async def test_read_endpoints_match_drf_without_threads(self):
+        with mock.patch('mods.async_views.delegate') as mods_delegate, \
+                mock.patch('categories.async_views.delegate') as categories_delegate:
+            await self.assertSameResponse('/api/mods/items/')
+            await self.assertSameResponse(
+                '/api/mods/items/', {'page': 2, 'category': 'trucks', 'ordering': '-view_count'}
+            )
+            await self.assertSameResponse('/api/categories/')
+            await self.assertSameResponse(f'/api/categories/{self.trucks.pk}/')
+            sync, served = await self.fetch(f'/api/mods/items/{self.mod.slug}/')
+        self.assertFalse(mods_delegate.called or categories_delegate.called)
+
+        self.assertEqual(served['ETag'], sync['ETag'])
+        sync, served = sync.json(), served.json()
+        # Each path counted its own view
+        self.assertEqual((sync.pop('view_count'), served.pop('view_count')), (1, 2))
+        self.assertEqual(served, sync)
+
+    async def test_other_requests_fall_back_to_drf(self):
+        await self.assertSameResponse('/api/mods/items/', {'pagination': 'cursor'})
+        await self.assertSameResponse('/api/mods/items/', {'page': 99})
+        await self.assertSameResponse('/api/mods/items/', {'search': 'scania'})
+        await self.assertSameResponse('/api/mods/items/', {'created_after': 'yesterday'})
+        await self.assertSameResponse('/api/mods/items/', {'game_version': '1.50'})
+        await self.assertSameResponse('/api/mods/items/', {'game_version': 'latest'})
+        await self.assertSameResponse('/api/mods/items/hidden/')
+
+        # Browsable API (its breadcrumbs follow the active URLconf)
+        sync, served = await self.fetch('/api/mods/items/', headers={'Accept': 'text/html'})
+        self.assertEqual((served.status_code, served['Content-Type']), (200, sync['Content-Type']))
+
+    async def test_not_modified(self):
+        with override_settings(ROOT_URLCONF='config.urls_async'):
+            first = await self.async_client.get('/api/mods/items/')
+            again = await self.async_client.get('/api/mods/items/', headers={'If-None-Match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+
+class ModBulkUploadTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+        Mod.objects.create(title='Scania R 2009', description='desc', category=self.category)
+        self.api = APIClient()
+        self.api.force_authenticate(User.objects.create(username='admin', is_staff=True))
+
+    def payload(self, count):
+        return [
+            {
+                'title': 'Scania R 2009' if i % 2 else f'Import {i}',
+                'description': 'desc',
+                'category': self.category.pk,
+                'download_links': [
+                    {'name': 'Mirror', 'url': 'https://example.com/a.zip', 'file_size': '1 MB'},
+                    {'name': 'Backup', 'url': 'https://example.com/b.zip', 'file_size': '1 MB'},
+                ],
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_upload_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.api.post('/api/mods/items/bulk/', self.payload(4), format='json')
+        with CaptureQueriesContext(connection) as large:
+            response = self.api.post('/api/mods/items/bulk/', self.payload(40), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+        slugs = list(Mod.objects.filter(title='Scania R 2009').values_list('slug', flat=True))
+        self.assertEqual(len(slugs), 23)
+        self.assertEqual(len(set(slugs)), 23)
+        self.assertEqual(DownloadLink.objects.count(), 88)
+        self.assertTrue(all(m['slug'] for m in response.json()))
+
+    def test_bulk_upload_titles_ending_in_numbers(self):
+        payload = self.payload(3)
+        for item, title in zip(payload, ['Map 1', 'Map', 'Map']):
+            item['title'] = title
+        response = self.api.post('/api/mods/items/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([m['slug'] for m in response.json()], ['map-1', 'map', 'map-2'])
+
+    def test_bulk_upload_retries_slug_collisions(self):
+        # A concurrent upload takes "scania-r-2009-1" between the lookup and the insert
+        stale = {'scania-r-2009': {0}}
+        fresh = {'scania-r-2009': {0, 1}}
+        bulk_create = Mod.objects.bulk_create
+
+        def clash(mods):
+            if bulk_create_mock.call_count == 1:
+                raise IntegrityError
+            return bulk_create(mods)
+
+        with mock.patch('core.slugs.taken_suffixes', side_effect=[stale, fresh]), \
+                mock.patch.object(Mod.objects, 'bulk_create', side_effect=clash) as bulk_create_mock:
+            response = self.api.post('/api/mods/items/bulk/', self.payload(2)[1:], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()[0]['slug'], 'scania-r-2009-2')
+
+    def test_bulk_upload_is_all_or_nothing(self):
+        payload = self.payload(3)
+        payload[2]['category'] = 9999
+        response = self.api.post('/api/mods/items/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Mod.objects.count(), 1)
+
+    def test_bulk_upload_requires_staff(self):
+        response = self.client.post('/api/mods/items/bulk/', self.payload(1), content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class WriteThrottleTests(CatalogTestCase):
+    FLOOD = 60
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=self.category, status='published')
+
+    def flood(self, url, payload, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            statuses = [self.client.post(url, payload, **extra).status_code for _ in range(self.FLOOD)]
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        return statuses, inserts
+
+    def test_comment_flood_writes_only_the_burst(self):
+        payload = {'mod_id': str(self.mod.id), 'content': 'spam', 'rating': 1}
+        statuses, inserts = self.flood('/api/mods/comments/', payload, REMOTE_ADDR='10.0.0.1')
+
+        # Burst of 5: one comment + one activity bucket insert each
+        self.assertEqual(statuses.count(201), 5)
+        self.assertEqual(statuses.count(429), self.FLOOD - 5)
+        self.assertEqual(len(inserts), 10)
+        self.mod.refresh_from_db()
+        self.assertEqual(self.mod.rating_count, 5)
+
+        response = self.client.post('/api/mods/comments/', payload, REMOTE_ADDR='10.0.0.1')
+        self.assertGreater(int(response['Retry-After']), 0)
+        # Reads are never throttled
+        self.assertEqual(self.client.get('/api/mods/comments/', REMOTE_ADDR='10.0.0.1').status_code, 200)
+
+    def test_buckets_are_per_forwarded_client(self):
+        payload = {'mod_id': str(self.mod.id), 'content': 'hi'}
+        for ip in ('203.0.113.1', '203.0.113.2'):
+            statuses, _ = self.flood('/api/mods/comments/', payload, HTTP_X_FORWARDED_FOR=ip)
+            self.assertEqual(statuses.count(201), 5)
+        self.assertEqual(Comment.objects.count(), 10)
+
+    def test_spoofed_forwarded_addresses_share_a_bucket(self):
+        payload = {'mod_id': str(self.mod.id), 'content': 'hi'}
+        statuses = [
+            self.client.post(
+                '/api/mods/comments/', payload, HTTP_X_FORWARDED_FOR=f'198.51.100.{i}, 203.0.113.1'
+            ).status_code
+            for i in range(20)
+        ]
+        self.assertEqual(statuses.count(201), 5)
+
+    def test_bucket_refills_over_time(self):
+        payload = {'mod_id': str(self.mod.id), 'content': 'hi'}
+        now = timezone.now().timestamp()
+        with mock.patch('core.throttling.time.time', return_value=now):
+            self.flood('/api/mods/comments/', payload)
+        with mock.patch('core.throttling.time.time', return_value=now + 24):  # 2 tokens at 5/min
+            statuses, _ = self.flood('/api/mods/comments/', payload)
+        self.assertEqual(statuses.count(201), 2)
+
+    def test_upload_flood_is_throttled_but_not_staff(self):
+        payload = {
+            'title': 'Spam', 'description': 'desc', 'category': self.category.pk,
+            'download_links': [{'name': 'M', 'url': 'https://example.com/f.zip', 'file_size': '1 MB'}],
+        }
+        client = APIClient()
+        statuses = [client.post('/api/mods/items/', payload, format='json').status_code for _ in range(20)]
+        self.assertEqual(statuses.count(201), 10)
+        self.assertEqual(statuses.count(429), 10)
+
+        client.force_authenticate(User.objects.create_user('admin', password='x', is_staff=True))
+        self.assertEqual(client.post('/api/mods/items/', payload, format='json').status_code, 201)
+
+
+class ModSlugTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Trucks')
+
+    def create(self, title='Scania R 2009'):
+        return Mod.objects.create(title=title, description='desc', category=self.category)
+
+    def test_next_suffix_in_one_query(self):
+        for _ in range(5):
+            self.create()
+        Mod.objects.filter(slug='scania-r-2009-2').delete()
+        # Slug lookup + savepoint-wrapped insert, however many titles collide
+        with self.assertNumQueries(4):
+            mod = self.create()
+        self.assertEqual(mod.slug, 'scania-r-2009-2')
+        self.assertEqual(self.create().slug, 'scania-r-2009-5')
+        self.assertEqual(self.create('Scania R').slug, 'scania-r')
+
+    def test_collision_with_concurrent_insert_retries(self):
+        self.create()
+        stale = {'scania-r-2009': set()}
+        with mock.patch('core.slugs.taken_suffixes', side_effect=[stale, {'scania-r-2009': {0}}]):
+            mod = self.create()
+        self.assertEqual(mod.slug, 'scania-r-2009-1')
+
+    def test_batch_slugs_that_end_in_numbers(self):
+        # "a-1" is also suffix 1 of "a", whether stored or earlier in the batch
+        self.assertEqual(allocate_slugs(Mod, ['map-1', 'map', 'map']), ['map-1', 'map', 'map-2'])
+        self.create('Map')
+        self.create('Map 1')
+        self.assertEqual(allocate_slugs(Mod, ['map', 'map-1', 'map-2']), ['map-2', 'map-1-1', 'map-2-1'])
+
+    def test_titles_ending_in_numbers_leave_suffixes_alone(self):
+        slugs = [self.create(title).slug for title in ('Scania 2009', 'Scania', 'Scania')]
+        self.assertEqual(slugs, ['scania-2009', 'scania', 'scania-1'])
+
+    def test_category_slugs_are_unique(self):
+        self.assertEqual(Category.objects.create(name='Trucks').slug, 'trucks-1')
+
+
+@skipIf(connection.vendor == 'sqlite', 'SQLite serializes writers with table locks')
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class ModSlugConcurrencyTests(TransactionTestCase):
+    def test_parallel_uploads_get_distinct_slugs(self):
+        category = Category.objects.create(name='Trucks')
+
+        def upload(_):
+            try:
+                return Mod.objects.create(title='Scania R 2009', description='desc', category=category).slug
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            slugs = list(pool.map(upload, range(24)))
+        self.assertEqual(len(set(slugs)), 24)
+        self.assertEqual(Mod.objects.count(), 24)
+
+
+class CompatibilityTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Maps')
+        self.going_east = DLC.objects.create(name='Going East!', slug='going-east')
+        self.iberia = DLC.objects.create(name='Iberia', slug='iberia')
+        self.v149 = GameVersion.objects.create(version='1.49')
+
+        def create(title, **kwargs):
+            return Mod.objects.create(title=title, description='desc', category=category, status='published', **kwargs)
+
+        self.promods = create('ProMods', min_game_version=self.v149)
+        self.promods.required_dlcs.set([self.going_east, self.iberia])
+        self.rusmap = create('RusMap')
+        self.rusmap.conflicts_with.add(self.promods)
+        self.sound = create('Sound Fix')
+
+    def check(self, mods, game_version='1.50.1.0s', dlcs=()):
+        return self.client.post(
+            '/api/mods/items/compatibility/',
+            {'game_version': game_version, 'dlcs': list(dlcs), 'mods': [str(m) for m in mods]},
+            content_type='application/json',
+        )
+
+    def test_parse_version(self):
+        self.assertEqual(parse_version('1.49.3.14s'), (1, 49, 3, 14))
+        self.assertEqual(parse_version('1.49.0'), parse_version('1.49'))
+        self.assertLess(parse_version('1.9'), parse_version('1.10'))
+        with self.assertRaises(ValueError):
+            parse_version('latest')
+
+    def test_whole_mod_list_in_constant_queries(self):
+        mods = [self.promods.id, self.rusmap.id, self.sound.id]
+        with self.assertNumQueries(3):
+            response = self.check(mods, dlcs=[self.going_east.id])
+        results = {r['slug']: r for r in response.json()['results']}
+
+        self.assertEqual(results['promods']['status'], 'incompatible')
+        self.assertEqual(
+            [i['message'] for i in results['promods']['issues']],
+            ['Missing required DLCs: Iberia.', 'Conflicts with installed mods: RusMap.'],
+        )
+        self.assertEqual(results['rusmap']['status'], 'warning')
+        self.assertEqual((results['sound-fix']['status'], results['sound-fix']['issues']), ('compatible', []))
+
+    def test_game_version_is_compared_numerically(self):
+        response = self.check([self.promods.id], game_version='1.5', dlcs=[self.going_east.id, self.iberia.id])
+        issue = response.json()['results'][0]['issues'][0]
+        self.assertEqual(issue['type'], 'version')
+
+        response = self.check([self.promods.id], game_version='1.49.0', dlcs=[self.going_east.id, self.iberia.id])
+        self.assertEqual(response.json()['results'][0]['status'], 'compatible')
+
+    def test_unknown_mods_and_bad_versions(self):
+        missing = uuid.uuid4()
+        self.assertEqual(self.check([self.sound.id, missing]).json()['not_found'], [str(missing)])
+        self.assertEqual(self.check([self.sound.id], game_version='latest').status_code, 400)
+
+    def test_stored_versions_must_parse(self):
+        with self.assertRaises(ValidationError):
+            GameVersion(version='beta').full_clean()
+        # Rows saved before the validator existed don't break the check
+        GameVersion.objects.filter(pk=self.v149.pk).update(version='beta')
+        response = self.check([self.promods.id], dlcs=[self.going_east.id, self.iberia.id])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['status'], 'compatible')
+
+
+class ModFilterTests(CatalogTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        trucks = Category.objects.create(name='Trucks')
+        maps = Category.objects.create(name='Maps')
+        v149 = GameVersion.objects.create(version='1.49')
+        v150 = GameVersion.objects.create(version='1.50')
+
+        def create(title, category, **kwargs):
+            return Mod.objects.create(title=title, description='desc', category=category, status='published', **kwargs)
+
+        create('Scania', trucks, uploader_name='alice', version='2.0', average_rating=4.5, min_game_version=v150)
+        create('Volvo', trucks, uploader_name='bob', version='1.0', average_rating=2.0, min_game_version=v149)
+        create('ProMods', maps, uploader_name='alice', version='2.0', average_rating=3.5)
+        Mod.objects.filter(title='ProMods').update(created_at=timezone.now() - timedelta(days=60))
+
+    def slugs(self, **params):
+        return sorted(m['slug'] for m in self.client.get('/api/mods/items/', params).json()['results'])
+
+    def test_filters(self):
+        self.assertEqual(self.slugs(category='trucks'), ['scania', 'volvo'])
+        self.assertEqual(self.slugs(uploader='alice'), ['promods', 'scania'])
+        self.assertEqual(self.slugs(author='bob'), ['volvo'])
+        self.assertEqual(self.slugs(version='2.0'), ['promods', 'scania'])
+        self.assertEqual(self.slugs(game_version='1.50'), ['promods', 'scania', 'volvo'])
+        self.assertEqual(self.slugs(min_rating=3, max_rating=4), ['promods'])
+        cutoff = (timezone.now() - timedelta(days=30)).isoformat()
+        self.assertEqual(self.slugs(created_before=cutoff), ['promods'])
+        self.assertEqual(self.slugs(created_after=cutoff), ['scania', 'volvo'])
+
+    def test_game_version_matches_mods_that_run_on_it(self):
+        # Minimum at or below the requested version, or none at all
+        self.assertEqual(self.slugs(game_version='1.49.2'), ['promods', 'volvo'])
+        self.assertEqual(self.slugs(game_version='1.10'), ['promods'])
+        self.assertEqual(self.slugs(game_version='1.50.1.0s'), ['promods', 'scania', 'volvo'])
+        response = self.client.get('/api/mods/items/', {'game_version': 'latest'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_combine(self):
+        self.assertEqual(self.slugs(uploader='alice', category='trucks', min_rating=4), ['scania'])
+        self.assertEqual(self.slugs(uploader='alice', q='volvo'), [])
+
+
+class ModImagePipelineTests(CatalogTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        # Local filesystem stand-in for Cloudinary
+        storage = override_settings(
+            DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+            MEDIA_ROOT=media_root,
+            IMAGE_PIPELINE_RUNNER='sync',
+        )
+        storage.enable()
+        self.addCleanup(storage.disable)
+        category = Category.objects.create(name='Trucks')
+        self.mod = Mod.objects.create(title='Scania', description='desc', category=category, status='published')
+
+    def upload(self, size=(2400, 1600)):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, 'PNG')
+        upload = SimpleUploadedFile('shot.png', buffer.getvalue(), content_type='image/png')
+        return self.client.post('/api/mods/images/', {'mod': str(self.mod.id), 'image': upload, 'is_cover': True})
+
+    def test_variants_rendered_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.upload()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['processing_status'], 'pending')
+        self.assertIsNone(response.json()['thumbnail'])
+
+        for callback in callbacks:
+            callback()
+        image = ModImage.objects.get()
+        self.assertEqual(image.processing_status, 'ready')
+        for field, bounds in [('thumbnail', (480, 270)), ('medium', (1280, 720))]:
+            with Image.open(getattr(image, field).path) as variant:
+                self.assertEqual(variant.format, 'WEBP')
+                self.assertLessEqual(variant.size[0], bounds[0])
+                self.assertLessEqual(variant.size[1], bounds[1])
+
+        listed = self.client.get('/api/mods/items/').json()['results'][0]
+        self.assertTrue(listed['cover_thumbnail'].endswith('-thumbnail.webp'))
+        self.assertTrue(listed['cover_image'].endswith('.png'))
+
+    def test_unreadable_upload_is_marked_failed(self):
+        with self.assertLogs('mods.images', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            image = ModImage.objects.create(
+                mod=self.mod, image=SimpleUploadedFile('broken.png', b'not an image')
+            )
+        image.refresh_from_db()
+        self.assertEqual(image.processing_status, 'failed')
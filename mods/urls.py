@@ -1,11 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ModViewSet, ModImageViewSet, CommentViewSet
+from .views import (
+    ModViewSet, ModImageViewSet, CommentViewSet, DLCViewSet, GameVersionViewSet,
+    DownloadLinkViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'items', ModViewSet, basename='mod')
 router.register(r'images', ModImageViewSet, basename='mod-image')
 router.register(r'comments', CommentViewSet, basename='comment')
+router.register(r'downloads', DownloadLinkViewSet, basename='download-link')
+router.register(r'dlcs', DLCViewSet, basename='dlc')
+router.register(r'game-versions', GameVersionViewSet, basename='game-version')
 
 urlpatterns = [
     path('', include(router.urls)),
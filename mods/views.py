@@ -3,58 +3,155 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import F
-from .models import Mod, ModImage, Comment
+from django.db.models import Count, Max, Prefetch
+from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from core.cache import (
+    CachedListMixin, cached_response, catalog_generation, catalog_last_modified, get_or_build, is_cacheable
+)
+from core.conditional import conditional_response
+from core.throttling import TokenBucketThrottle, client_ip
+from .models import Mod, ModImage, Comment, DLC, DownloadLink, GameVersion
 from .serializers import (
-    ModListSerializer, ModDetailSerializer, ModCreateSerializer, 
-    ModImageSerializer, CommentSerializer
+    ModListRowSerializer, ModDetailRowSerializer, ModDetailSerializer, ModCreateSerializer,
+    ModImageSerializer, CommentSerializer, LATEST_COMMENTS, BULK_UPLOAD_LIMIT,
+    CompatibilityCheckSerializer, DLCSerializer, GameVersionSerializer
 )
-from .filters import ModFilter
+from .services import check_mods_compatibility
+from .filters import ModFilter, ModSearchFilter, CommentFilter
+from .pagination import SelectablePagination
+from .counters import download_counter, overlay_live_counts, view_counter
 
-class ModViewSet(viewsets.ModelViewSet):
+class ModViewSet(CachedListMixin, viewsets.ModelViewSet):
     lookup_field = 'slug'
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = SelectablePagination
+    filter_backends = [DjangoFilterBackend, ModSearchFilter, filters.OrderingFilter]
     filterset_class = ModFilter
-    search_fields = ['title', 'description', 'uploader_name']
-    ordering_fields = ['created_at', 'view_count', 'average_rating']
+    throttle_scope = 'uploads'
+    ordering_fields = ['created_at', 'view_count', 'average_rating', 'trending_score', 'top_rated_score']
 
-    def get_queryset(self):
+    def get_visible_queryset(self):
         # Admins can see everything in lists
         if self.request.user.is_staff:
             return Mod.objects.all()
-            
+
         # Public list only shows Published mods
         return Mod.objects.filter(status='published')
 
+    def get_queryset(self):
+        queryset = self.get_visible_queryset()
+        if self.action == 'list':
+            # Plain rows for ModListRowSerializer; category and the
+            # denormalized cover join into the page query
+            queryset = queryset.values(*ModListRowSerializer.columns)
+        elif self.action == 'retrieve':
+            queryset = queryset.annotate(comment_count=Count('comments')).values(*ModDetailRowSerializer.columns)
+        elif self.action != 'create':
+            # Detail: every nested relation in a fixed number of queries
+            queryset = queryset.select_related('category').prefetch_related(
+                'download_links',
+                'images',
+                'required_dlcs',
+                'conflicts_with',
+                Prefetch(
+                    'comments',
+                    queryset=Comment.objects.order_by('-created_at', '-pk')[:LATEST_COMMENTS],
+                    to_attr='latest_comments',
+                ),
+            ).annotate(comment_count=Count('comments'))
+        return queryset
+
     def get_serializer_class(self):
+        # Reads skip DRF's per-field work; writes (and their responses) keep it
         if self.action == 'list':
-            return ModListSerializer
+            return ModListRowSerializer
+        if self.action == 'retrieve':
+            return ModDetailRowSerializer
         if self.action == 'create':
             return ModCreateSerializer
         return ModDetailSerializer
 
+    def get_throttles(self):
+        # Only public uploads; the other writes are staff-only
+        if self.action == 'create':
+            return [TokenBucketThrottle()]
+        return super().get_throttles()
+
     def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return client_ip(request)
 
     def perform_create(self, serializer):
         # Capture the uploader's IP address
         ip_address = self.get_client_ip(self.request)
         serializer.save(uploader_ip=ip_address)
 
+    def list(self, request, *args, **kwargs):
+        # Every write that can change a list page bumps the catalog generation,
+        # so it validates list pages without touching the database
+        return conditional_response(
+            request, (catalog_generation(), request.user.is_staff), catalog_last_modified(),
+            lambda: super(ModViewSet, self).list(request, *args, **kwargs),
+        )
+
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        
-        # Increment view count on retrieve
-        Mod.objects.filter(pk=instance.pk).update(view_count=F('view_count') + 1)
-        instance.refresh_from_db()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        state = (
+            self.get_visible_queryset()
+            .filter(slug=kwargs['slug'])
+            .values('id', 'updated_at', 'view_count', 'download_count')
+            .annotate(last_comment=Max('comments__created_at'), comments=Count('comments'))
+            .first()
+        )
+        if state is None:
+            return self.render_detail(request)
+
+        # Buffer the view; the flusher writes it to the row in bulk later
+        view_counter.record(state['id'])
+        last_modified = max(filter(None, [state['updated_at'], state['last_comment']]))
+        version = (
+            state['updated_at'], state['last_comment'], state['comments'], state['view_count'], state['download_count']
+        )
+        return conditional_response(request, version, last_modified, lambda: self.render_detail(request, state))
+
+    def render_detail(self, request, state=None):
+        response = cached_response(request, lambda: self.get_serializer(self.get_object()).data)
+        if state is not None:
+            # The cached counters are as old as the payload; the row isn't
+            overlay_live_counts(response.data, state)
+        return response
     
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[permissions.IsAdminUser])
+    def bulk_create(self, request):
+        """Import many mods (with their download links) in one transaction"""
+        serializer = ModCreateSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=BULK_UPLOAD_LIMIT
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(uploader_ip=self.get_client_ip(request))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def compatibility(self, request):
+        """Check a user's whole installed mod list against their game version and DLCs"""
+        serializer = CompatibilityCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        setup = serializer.validated_data
+
+        mods = list(
+            self.get_visible_queryset()
+            .filter(id__in=setup['mods'])
+            .select_related('min_game_version')
+            .only('id', 'slug', 'title', 'min_game_version__version')
+        )
+        checked = check_mods_compatibility(mods, setup['game_version'], setup['dlcs'], setup['mods'])
+        found = {mod.id for mod in mods}
+        return Response({
+            'results': [
+                {'id': mod.id, 'slug': mod.slug, 'title': mod.title, **checked[mod.id]}
+                for mod in mods
+            ],
+            'not_found': [mod_id for mod_id in setup['mods'] if mod_id not in found],
+        })
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
     def approve(self, request, slug=None):
         mod = self.get_object()
@@ -69,6 +166,37 @@ class ModViewSet(viewsets.ModelViewSet):
         mod.save()
         return Response({'status': 'rejected'})
 
+class DownloadLinkViewSet(viewsets.GenericViewSet):
+    """GET /downloads/<id>/ counts the click and redirects to the file host"""
+    lookup_value_regex = r'\d+'
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return DownloadLink.objects.all()
+        return DownloadLink.objects.filter(mod__status='published')
+
+    def retrieve(self, request, pk=None):
+        def resolve():
+            return get_object_or_404(self.get_queryset().values('url', 'mod_id'), pk=pk)
+
+        # Link targets come from the response cache, so a click is usually
+        # a cache read plus an in-memory increment
+        target = get_or_build(request, resolve)[0] if is_cacheable(request) else resolve()
+        download_counter.record(int(pk), target['mod_id'])
+        response = HttpResponseRedirect(target['url'])
+        response['Cache-Control'] = 'no-store'  # Every click has to reach us
+        return response
+
+class DLCViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = DLC.objects.order_by('name')
+    serializer_class = DLCSerializer
+    pagination_class = None
+
+class GameVersionViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = GameVersion.objects.order_by('-released_at', '-version')
+    serializer_class = GameVersionSerializer
+    pagination_class = None
+
 class ModImageViewSet(viewsets.ModelViewSet):
     """Separate endpoint to upload images for a specific mod"""
     queryset = ModImage.objects.all()
@@ -83,10 +211,13 @@ class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = SelectablePagination
+    filterset_class = CommentFilter
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'comments'
 
     def perform_create(self, serializer):
         mod_id = self.request.data.get('mod_id')
         if mod_id:
-            instance = serializer.save(mod_id=mod_id)
-            # Update mod rating
-            instance.mod.calculate_rating()
\ No newline at end of file
+            # Comment.save keeps the mod's rating aggregates up to date
+            serializer.save(mod_id=mod_id)
\ No newline at end of file